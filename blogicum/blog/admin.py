@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import Category, Comment, Location, Post
+from .models import Category, Comment, Job, Location, Post
+from .search import fts_available, matching_ids
 
 admin.site.empty_value_display = 'Не задано'
 
@@ -46,8 +47,26 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('is_published',)
     list_display_links = ('title',)
 
+    def get_search_results(self, request, queryset, search_term):
+        if not fts_available() or not search_term.split():
+            return super().get_search_results(
+                request, queryset, search_term)
+        return queryset.filter(pk__in=matching_ids(search_term)), False
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'task',
+        'status',
+        'attempts',
+        'run_after',
+        'updated_at'
+    )
+    list_filter = ('status', 'task')
+
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Location, LocationAdmin)
 admin.site.register(Comment, CommentAdmin)
+admin.site.register(Job, JobAdmin)
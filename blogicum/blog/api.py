@@ -0,0 +1,210 @@
+from functools import partial, wraps
+
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_safe
+
+from .conditional import (
+    category_last_modified, conditional_anonymous_page, index_last_modified,
+    post_last_modified, profile_last_modified, respond_conditionally)
+from .constants import API_MAX_PAGE_SIZE, COMMENTS_PER_PAGE, POSTS_PER_PAGE
+from .feed import author_feed, category_feed, is_visible, post_feed
+from .lookups import categories, locations, published_category
+from .models import Post, User
+from .pagination import KeysetPaginator, comment_batch
+
+
+class ApiError(Exception):
+    pass
+
+
+def category_data(category_id):
+    category = categories.get(category_id)
+    if category is None:
+        return None
+    return {'slug': category.slug, 'title': category.title}
+
+
+def location_data(location_id):
+    location = locations.get(location_id)
+    return location and location.title
+
+
+def image_url(post, request):
+    return post.image and request.build_absolute_uri(post.image.url) or None
+
+
+# Поле ответа: (столбцы для .only(), значение).
+POST_FIELDS = {
+    'id': (('id',), lambda post, request: post.pk),
+    'url': (('id',), lambda post, request: request.build_absolute_uri(
+        post.get_absolute_url())),
+    'title': (('title',), lambda post, request: post.title),
+    'text': (('text',), lambda post, request: post.text),
+    'pub_date': (('pub_date',), lambda post, request: post.pub_date),
+    'updated_at': (('updated_at',), lambda post, request: post.updated_at),
+    'is_published': (
+        ('is_published',), lambda post, request: post.is_published),
+    'author': (
+        ('author__username',), lambda post, request: post.author.username),
+    'category': (
+        ('category',), lambda post, request: category_data(post.category_id)),
+    'location': (
+        ('location',), lambda post, request: location_data(post.location_id)),
+    'image': (('image',), image_url),
+    'comment_count': (
+        ('comment_count',), lambda post, request: post.comment_count),
+}
+DEFAULT_POST_FIELDS = (
+    'id', 'url', 'title', 'pub_date', 'author', 'category', 'comment_count')
+
+COMMENT_FIELDS = {
+    'id': (('id',), lambda comment, request: comment.pk),
+    'text': (('text',), lambda comment, request: comment.text),
+    'created_at': (
+        ('created_at',), lambda comment, request: comment.created_at),
+    'author': (
+        ('author__username',),
+        lambda comment, request: comment.author.username),
+}
+DEFAULT_COMMENT_FIELDS = tuple(COMMENT_FIELDS)
+
+
+def requested_fields(request, available, default):
+    value = request.GET.get('fields', '')
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = set(fields) - set(available)
+    if unknown:
+        raise ApiError(f'Неизвестные поля: {", ".join(sorted(unknown))}.')
+    return fields or list(default)
+
+
+def page_size(request, default):
+    try:
+        size = int(request.GET.get('limit', default))
+    except ValueError:
+        raise ApiError('Параметр limit должен быть целым числом.')
+    return max(1, min(size, API_MAX_PAGE_SIZE))
+
+
+def project(queryset, fields, spec, required=()):
+    columns = set(required)
+    for name in fields:
+        columns.update(spec[name][0])
+    queryset = queryset.select_related(None)
+    relations = {
+        column.split('__')[0] for column in columns if '__' in column}
+    if relations:
+        queryset = queryset.select_related(*relations)
+    return queryset.only(*columns)
+
+
+def serialize(obj, fields, spec, request):
+    return {name: spec[name][1](obj, request) for name in fields}
+
+
+def page_link(request, name, cursor):
+    if cursor is None:
+        return None
+    params = request.GET.copy()
+    params.pop('after', None)
+    params.pop('before', None)
+    params[name] = cursor
+    return request.build_absolute_uri(f'{request.path}?{params.urlencode()}')
+
+
+def json_response(data, status=200):
+    return JsonResponse(
+        data, status=status, json_dumps_params={'ensure_ascii': False})
+
+
+def api_view(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as error:
+            return json_response({'error': str(error)}, status=400)
+        except Http404:
+            return json_response({'error': 'Не найдено.'}, status=404)
+    return require_safe(wrapper)
+
+
+def post_list(request, feed):
+    fields = requested_fields(request, POST_FIELDS, DEFAULT_POST_FIELDS)
+    page = KeysetPaginator(
+        lambda now: project(feed(now), fields, POST_FIELDS, ('pub_date',)),
+        page_size(request, POSTS_PER_PAGE),
+    ).get_page(request.GET)
+    return json_response({
+        'results': [
+            serialize(post, fields, POST_FIELDS, request) for post in page],
+        'next': page_link(request, 'after', page.older_cursor),
+        'previous': page_link(request, 'before', page.newer_cursor),
+    })
+
+
+def visible_post(request, pk, fields=()):
+    post = get_object_or_404(project(
+        Post.objects.all(), fields, POST_FIELDS,
+        ('pub_date', 'updated_at', 'is_published', 'author')), pk=pk)
+    if not is_visible(post, request.user):
+        raise Http404
+    return post
+
+
+@api_view
+@conditional_anonymous_page(index_last_modified)
+def posts(request):
+    return post_list(request, post_feed)
+
+
+@api_view
+@conditional_anonymous_page(category_last_modified)
+def category_posts(request, category_slug):
+    category = published_category(category_slug)
+    if category is None:
+        raise Http404
+    return post_list(request, partial(category_feed, category))
+
+
+@api_view
+@conditional_anonymous_page(profile_last_modified)
+def profile_posts(request, username):
+    author = get_object_or_404(User.objects.only('pk'), username=username)
+    return post_list(
+        request, partial(author_feed, author, request.user))
+
+
+@api_view
+def post_detail(request, pk):
+    fields = requested_fields(request, POST_FIELDS, DEFAULT_POST_FIELDS)
+    post = visible_post(request, pk, fields)
+    return respond_conditionally(
+        request, post_last_modified(post),
+        lambda request: json_response(
+            serialize(post, fields, POST_FIELDS, request)))
+
+
+@api_view
+def post_comments(request, pk):
+    fields = requested_fields(
+        request, COMMENT_FIELDS, DEFAULT_COMMENT_FIELDS)
+    post = visible_post(request, pk)
+
+    def respond(request):
+        comments, next_cursor = comment_batch(
+            # post_id нужен менеджеру связи: без него Django подгружает
+            # его отдельным запросом для каждого комментария.
+            project(post.comments.all(), fields, COMMENT_FIELDS,
+                    ('created_at', 'post')),
+            request.GET.get('after', ''),
+            page_size(request, COMMENTS_PER_PAGE))
+        return json_response({
+            'results': [
+                serialize(comment, fields, COMMENT_FIELDS, request)
+                for comment in comments],
+            'next': page_link(request, 'after', next_cursor),
+        })
+
+    return respond_conditionally(request, post_last_modified(post), respond)
@@ -1,7 +1,23 @@
+import logging
+
 from django.apps import AppConfig
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
 
 
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        if settings.TEMPLATE_WARMUP:
+            from .warmup import warm_templates
+            timings = warm_templates()
+            for name, seconds in timings:
+                logger.debug('Шаблон %s: %.1f мс', name, seconds * 1000)
+            logger.info(
+                'Скомпилировано шаблонов: %d за %.1f мс', len(timings),
+                sum(seconds for _, seconds in timings) * 1000)
@@ -0,0 +1,44 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from .cache import PAGE_GROUP_KEY, cached_page_response, page_cache_key
+
+
+async def cache_get(key):
+    backend = caches['default']
+    if isinstance(backend, LocMemCache):
+        # Память процесса: ввода-вывода нет, поток не нужен.
+        return backend.get(key)
+    if hasattr(backend, 'aget'):
+        return await backend.aget(key)
+    return await sync_to_async(backend.get, thread_sensitive=False)(key)
+
+
+def is_anonymous(request):
+    # Без cookie сессии пользователь заведомо анонимный, и request.user
+    # можно не загружать из базы.
+    return settings.SESSION_COOKIE_NAME not in request.COOKIES
+
+
+def async_page(view):
+    sync_view = sync_to_async(view)
+
+    async def wrapper(request, *args, **kwargs):
+        if request.method in ('GET', 'HEAD') and is_anonymous(request):
+            group = view.page_group.format(**kwargs)
+            version = await cache_get(PAGE_GROUP_KEY.format(group))
+            response = version and await cache_get(
+                page_cache_key(request, group, version))
+            if response is not None:
+                return cached_page_response(request, response)
+        return await sync_view(request, *args, **kwargs)
+
+    return wraps(view)(wrapper)
+
+
+def read_page(view):
+    return async_page(view) if settings.ASYNC_VIEWS else view
@@ -0,0 +1,233 @@
+import hashlib
+import time
+from functools import wraps
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Min
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from .models import Category, Post, User
+from .pagination import decode_cursor
+
+POST_CARD_KEY = 'post_card:{}'
+POST_CARD_HITS = 'post_card:hits'
+POST_CARD_MISSES = 'post_card:misses'
+POST_CARD_RENDER_US = 'post_card:render_us'
+
+
+def post_card_key(post_id):
+    return POST_CARD_KEY.format(post_id)
+
+
+def post_card_fingerprint(post):
+    category = post.category
+    location = post.location
+    parts = (
+        post.updated_at, post.pub_date, post.is_published, post.title,
+        post.text, post.image.name, post.comment_count,
+        post.author.username,
+        category and (category.slug, category.title, category.is_published),
+        location and (location.title, location.is_published),
+    )
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def _count(key, delta=1):
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key, delta)
+
+
+def render_post_card(post):
+    key = post_card_key(post.pk)
+    fingerprint = post_card_fingerprint(post)
+    cached = cache.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        _count(POST_CARD_HITS)
+        return cached[1]
+    start = time.perf_counter()
+    html = render_to_string('includes/post_card.html', {'post': post})
+    _count(POST_CARD_MISSES)
+    _count(POST_CARD_RENDER_US,
+           int((time.perf_counter() - start) * 1_000_000))
+    cache.set(key, (fingerprint, html), settings.POST_CARD_CACHE_TIMEOUT)
+    return html
+
+
+def invalidate_post_cards(post_ids):
+    cache.delete_many([post_card_key(post_id) for post_id in post_ids])
+
+
+def post_card_stats():
+    hits = cache.get(POST_CARD_HITS, 0)
+    misses = cache.get(POST_CARD_MISSES, 0)
+    render_us = cache.get(POST_CARD_RENDER_US, 0)
+    avg_render_us = render_us / misses if misses else 0
+    return {
+        'hits': hits,
+        'misses': misses,
+        'avg_render_ms': avg_render_us / 1000,
+        'saved_ms': hits * avg_render_us / 1000,
+    }
+
+
+PAGE_KEY = 'page:{}'
+PAGE_GROUP_KEY = 'page_group:{}'
+NEXT_PUBLICATION_KEY = 'next_publication'
+
+
+def page_number(request):
+    # Так же разбирает номер Paginator.get_page(): нечисловой номер
+    # означает первую страницу.
+    try:
+        return int(request.GET.get('page', 1))
+    except ValueError:
+        return 1
+
+
+def page_params(request):
+    # Ключ строится из разобранных значений, а не из строки запроса:
+    # ?page=abc1 и битый курсор дают ту же страницу, что и без них.
+    params = []
+    if page_number(request) != 1:
+        params.append(('page', page_number(request)))
+    for name in ('after', 'before'):
+        cursor = decode_cursor(request.GET.get(name, ''))
+        if cursor:
+            params.append((name, f'{cursor[0].isoformat()}|{cursor[1]}'))
+    return params
+
+
+def page_cache_key(request, group, version):
+    url = f'{group}:{version}:{request.path}?{urlencode(page_params(request))}'
+    return PAGE_KEY.format(hashlib.md5(url.encode()).hexdigest())
+
+
+def page_group_version(group):
+    key = PAGE_GROUP_KEY.format(group)
+    version = cache.get(key)
+    if version is None:
+        # Счётчик начинается не с единицы: если его вытеснят из кэша,
+        # новые ключи не совпадут со старыми, ещё не истёкшими.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def is_cacheable_page(request, response):
+    # Сохраняется только страница, которую описывает ключ: номер вне
+    # диапазона отдаёт последнюю страницу, а страницам без пагинации
+    # параметры не нужны вовсе.
+    context = getattr(response, 'context_data', None) or {}
+    page_obj = context.get('page_obj')
+    if page_obj is None:
+        return not page_params(request)
+    return getattr(page_obj, 'number', 1) == page_number(request)
+
+
+def refresh_next_publication():
+    next_pub_date = Post.objects.filter(
+        is_published=True, pub_date__gt=timezone.now()
+    ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+    cache.set(NEXT_PUBLICATION_KEY, (next_pub_date,), timeout=None)
+    return next_pub_date
+
+
+def next_publication():
+    cached = cache.get(NEXT_PUBLICATION_KEY)
+    if cached is None or (
+            cached[0] is not None and cached[0] <= timezone.now()):
+        return refresh_next_publication()
+    return cached[0]
+
+
+def page_cache_timeout(timeout=None):
+    now = timezone.now()
+    next_pub_date = next_publication()
+    if timeout is None:
+        timeout = settings.PAGE_CACHE_TIMEOUT
+    if next_pub_date is not None:
+        timeout = min(timeout, int((next_pub_date - now).total_seconds()))
+    return timeout
+
+
+def post_page_groups(post_ids, category_ids=(), author_ids=()):
+    rows = Post.objects.filter(pk__in=post_ids).values_list(
+        'category_id', 'category__slug', 'author_id', 'author__username')
+    slugs, usernames = set(), set()
+    category_ids, author_ids = set(category_ids), set(author_ids)
+    for category_id, slug, author_id, username in rows:
+        slugs.add(slug)
+        usernames.add(username)
+        category_ids.discard(category_id)
+        author_ids.discard(author_id)
+    category_ids.discard(None)
+    if category_ids:
+        slugs.update(Category.objects.filter(
+            pk__in=category_ids).values_list('slug', flat=True))
+    if author_ids:
+        usernames.update(User.objects.filter(
+            pk__in=author_ids).values_list('username', flat=True))
+    slugs.discard(None)
+    return [
+        'index',
+        *(f'post:{post_id}' for post_id in post_ids),
+        *(f'category:{slug}' for slug in slugs),
+        *(f'author:{username}' for username in usernames),
+    ]
+
+
+def purge_pages(*groups):
+    # Новая версия группы меняет ключи всех её страниц, а старые
+    # записи истекают сами.
+    for group in set(groups):
+        try:
+            cache.incr(PAGE_GROUP_KEY.format(group))
+        except ValueError:
+            pass
+
+
+def cached_page_response(request, response):
+    return get_conditional_response(
+        request, etag=response.get('ETag'),
+        last_modified=parse_http_date_safe(response.get('Last-Modified')),
+        response=response)
+
+
+def cache_anonymous_page(group):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (request.method not in ('GET', 'HEAD')
+                    or request.user.is_authenticated):
+                return view(request, *args, **kwargs)
+            page_group = group.format(**kwargs)
+            key = page_cache_key(
+                request, page_group, page_group_version(page_group))
+            response = cache.get(key)
+            if response is not None:
+                return cached_page_response(request, response)
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                response.render()
+            # Форма с CSRF-токеном привязана к cookie посетителя; сама
+            # cookie ставится middleware уже после этой обёртки.
+            if (response.status_code == HTTPStatus.OK
+                    and not response.cookies
+                    and not request.META.get('CSRF_COOKIE_USED')
+                    and is_cacheable_page(request, response)):
+                timeout = page_cache_timeout()
+                if timeout > 0:
+                    cache.set(key, response, timeout)
+            return response
+        wrapper.page_group = group
+        return wrapper
+    return decorator
@@ -0,0 +1,98 @@
+import hashlib
+from functools import wraps
+
+from django.core.cache import cache
+from django.utils import timezone
+from django.views.decorators.http import condition
+
+from .feed import category_feed, post_feed
+from .lookups import published_category
+from .models import Post
+
+CONTENT_CHANGED_KEY = 'content_changed_at'
+
+
+def mark_content_changed():
+    cache.set(CONTENT_CHANGED_KEY, timezone.now(), None)
+
+
+def content_changed_at():
+    # Изменения, которых не видно по updated_at публикаций: удаления,
+    # правки категорий, местоположений и авторов. Если отметка вытеснена
+    # из кэша, считаем, что всё изменилось сейчас.
+    return cache.get_or_set(CONTENT_CHANGED_KEY, timezone.now, None)
+
+
+def latest_queryset(queryset, field):
+    return queryset.order_by(f'-{field}').values_list(field, flat=True)[:1]
+
+
+def latest_value(queryset, field):
+    return next(iter(latest_queryset(queryset, field)), None)
+
+
+def latest(*values):
+    return max(filter(None, values), default=None)
+
+
+def index_last_modified(request):
+    return latest(
+        latest_value(Post.objects.all(), 'updated_at'),
+        latest_value(post_feed(), 'pub_date'),
+        content_changed_at(),
+    )
+
+
+def category_last_modified(request, category_slug):
+    category = published_category(category_slug)
+    if category is None:
+        return None
+    return latest(
+        latest_value(Post.objects.filter(category=category), 'updated_at'),
+        latest_value(category_feed(category), 'pub_date'),
+        content_changed_at(),
+    )
+
+
+def profile_last_modified(request, username):
+    posts = Post.objects.filter(author__username=username)
+    return latest(
+        latest_value(posts, 'updated_at'),
+        latest_value(
+            posts.filter(is_published=True, pub_date__lte=timezone.now()),
+            'pub_date'),
+        content_changed_at(),
+    )
+
+
+def post_last_modified(post):
+    return latest(
+        post.updated_at,
+        post.pub_date if post.pub_date <= timezone.now() else None,
+        content_changed_at(),
+    )
+
+
+def respond_conditionally(request, last_modified, view, *args, **kwargs):
+    if (request.method not in ('GET', 'HEAD')
+            or request.user.is_authenticated or last_modified is None):
+        return view(request, *args, **kwargs)
+    etag = hashlib.md5(last_modified.isoformat().encode()).hexdigest()
+    return condition(
+        etag_func=lambda *args, **kwargs: etag,
+        last_modified_func=lambda *args, **kwargs: last_modified,
+    )(view)(request, *args, **kwargs)
+
+
+def conditional_anonymous_page(last_modified_func):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            last_modified = None
+            if (request.method in ('GET', 'HEAD')
+                    and not request.user.is_authenticated):
+                last_modified = last_modified_func(request, *args, **kwargs)
+            return respond_conditionally(
+                request, last_modified, view, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,3 +1,13 @@
 MAX_LENGTH_256 = 256
 
 MAX_LENGTH_64 = 64
+
+POSTS_PER_PAGE = 10
+
+COMMENTS_PER_PAGE = 20
+
+FEED_SIZE = 20
+
+SITEMAP_CHUNK_SIZE = 10000
+
+API_MAX_PAGE_SIZE = 100
@@ -0,0 +1,40 @@
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Post
+
+
+def published_filter(now=None):
+    return Q(
+        is_published=True,
+        pub_date__lte=now or timezone.now(),
+        category__is_published=True,
+    )
+
+
+def post_feed(now=None):
+    return Post.objects.select_related('author').filter(
+        published_filter(now)
+    ).order_by('-pub_date')
+
+
+def category_feed(category, now=None):
+    return Post.objects.select_related('author').filter(
+        is_published=True,
+        pub_date__lte=now or timezone.now(),
+        category=category,
+    ).order_by('-pub_date')
+
+
+def author_feed(author, viewer=None, now=None):
+    visible = published_filter(now)
+    if viewer is not None and viewer.pk == author.pk:
+        visible = Q()
+    return Post.objects.select_related('author').filter(
+        visible, author=author
+    ).order_by('-pub_date')
+
+
+def is_visible(post, viewer, now=None):
+    return post.author_id == viewer.id or (
+        post.is_published and post.pub_date <= (now or timezone.now()))
@@ -0,0 +1,64 @@
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+# Ширина вариантов изображения в пикселях; @2x — для экранов высокой
+# плотности.
+RENDITIONS = {
+    'card': 640,
+    'card@2x': 1280,
+    'detail': 1280,
+    'detail@2x': 2560,
+}
+JPEG_QUALITY = 82
+
+
+def rendition_name(name, rendition):
+    root, _ = os.path.splitext(name)
+    return f'{root}_{rendition.replace("@", "_")}.jpg'
+
+
+def _flatten(image):
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def generate_renditions(name, storage=default_storage):
+    with storage.open(name) as original:
+        image = _flatten(Image.open(original))
+    created = []
+    for rendition, width in RENDITIONS.items():
+        variant = image.copy()
+        variant.thumbnail((width, width * 4), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        variant.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True,
+                     progressive=True)
+        target = rendition_name(name, rendition)
+        if storage.exists(target):
+            storage.delete(target)
+        created.append(storage.save(target, ContentFile(buffer.getvalue())))
+    return created
+
+
+def has_renditions(name, storage=default_storage):
+    return all(
+        storage.exists(rendition_name(name, rendition))
+        for rendition in RENDITIONS)
+
+
+def rendition_urls(image, rendition):
+    # Варианты пишутся по очереди, и @2x идёт после основного: если он уже
+    # есть, готовы оба, так что хранилище опрашивается один раз.
+    retina = rendition_name(image.name, f'{rendition}@2x')
+    if not image.storage.exists(retina):
+        return image.url, image.url
+    return (image.storage.url(rendition_name(image.name, rendition)),
+            image.storage.url(retina))
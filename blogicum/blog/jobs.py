@@ -0,0 +1,128 @@
+import os
+import traceback
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .cache import invalidate_post_cards, post_page_groups, purge_pages
+from .images import generate_renditions
+from .models import Job, Post
+
+RETRY_DELAY = 10
+# Задача дольше этого времени в статусе «выполняется» считается брошенной
+# упавшим обработчиком и возвращается в очередь.
+RUNNING_TIMEOUT = 60 * 10
+ORIENTATION = 0x0112
+ORIGINAL_JPEG_QUALITY = 95
+# Сведения, нужные для отображения; всё остальное (EXIF, XMP, текстовые
+# блоки PNG) при очистке отбрасывается.
+KEPT_INFO = ('transparency', 'icc_profile', 'dpi')
+TASKS = {}
+
+
+def task(func):
+    TASKS[func.__name__] = func
+    return func
+
+
+def enqueue(task_name, **payload):
+    def create():
+        Job.objects.create(task=task_name, payload=payload)
+    transaction.on_commit(create)
+
+
+def requeue_stale_jobs(now):
+    stale = Job.objects.filter(
+        status=Job.RUNNING,
+        updated_at__lt=now - timezone.timedelta(seconds=RUNNING_TIMEOUT))
+    error = 'Обработчик не завершил задачу.'
+    # Оборванный запуск тоже считается попыткой.
+    stale.filter(attempts__gte=F('max_attempts') - 1).update(
+        status=Job.FAILED, attempts=F('attempts') + 1, last_error=error,
+        updated_at=now)
+    stale.update(
+        status=Job.PENDING, attempts=F('attempts') + 1, last_error=error,
+        run_after=now, updated_at=now)
+
+
+def claim_job():
+    now = timezone.now()
+    requeue_stale_jobs(now)
+    for job in Job.objects.filter(status=Job.PENDING, run_after__lte=now)[:10]:
+        claimed = Job.objects.filter(
+            pk=job.pk, status=Job.PENDING
+        ).update(status=Job.RUNNING, updated_at=timezone.now())
+        if claimed:
+            job.status = Job.RUNNING
+            return job
+    return None
+
+
+def run_job(job):
+    job.attempts += 1
+    try:
+        TASKS[job.task](**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = Job.PENDING
+            job.run_after = timezone.now() + timezone.timedelta(
+                seconds=RETRY_DELAY * 2 ** (job.attempts - 1))
+        else:
+            job.status = Job.FAILED
+    else:
+        job.status = Job.DONE
+        job.last_error = ''
+    job.save(update_fields=(
+        'status', 'attempts', 'run_after', 'last_error', 'updated_at'))
+    return job
+
+
+def replace_file(name, content, storage=default_storage):
+    # Файл пишется рядом под временным именем и подменяет исходный одной
+    # операцией, так что читатели не застают его отсутствующим.
+    temp_name = storage.save(f'{name}.tmp', content)
+    try:
+        os.replace(storage.path(temp_name), storage.path(name))
+    except Exception:
+        storage.delete(temp_name)
+        raise
+
+
+def strip_exif(name, storage=default_storage):
+    with storage.open(name) as original:
+        image = Image.open(original)
+        image_format = image.format
+        if not image.getexif() and 'exif' not in image.info:
+            return
+        options = {}
+        rotated = image.getexif().get(ORIENTATION, 1) != 1
+        if rotated:
+            image = ImageOps.exif_transpose(image)
+        if image_format == 'JPEG':
+            options = (
+                {'quality': ORIGINAL_JPEG_QUALITY} if rotated
+                else {'quality': 'keep', 'subsampling': 'keep'})
+        # И исходный файл, и копия после exif_transpose хранят EXIF в info,
+        # а PNG записывает его оттуда обратно.
+        image.info = {
+            key: value for key, value in image.info.items()
+            if key in KEPT_INFO}
+        buffer = BytesIO()
+        image.save(buffer, image_format, **options)
+    replace_file(name, ContentFile(buffer.getvalue()), storage)
+
+
+@task
+def process_image(name):
+    strip_exif(name)
+    generate_renditions(name)
+    post_ids = list(
+        Post.objects.filter(image=name).values_list('pk', flat=True))
+    invalidate_post_cards(post_ids)
+    purge_pages(*post_page_groups(post_ids))
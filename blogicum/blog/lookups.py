@@ -0,0 +1,61 @@
+from uuid import uuid4
+
+from django.core.cache import cache
+
+from .models import Category, Location
+
+
+class LookupTable:
+    def __init__(self, model):
+        self.model = model
+        self.version_key = f'lookup_version:{model._meta.label_lower}'
+        self.version = None
+        self.rows = {}
+        self.indexes = {}
+
+    def all(self):
+        version = cache.get_or_set(
+            self.version_key, uuid4().hex, timeout=None)
+        if version != self.version:
+            self.rows = {obj.pk: obj for obj in self.model.objects.all()}
+            self.indexes = {}
+            self.version = version
+        return self.rows
+
+    def get(self, pk):
+        return self.all().get(pk)
+
+    def find(self, field, value):
+        rows = self.all()
+        if field not in self.indexes:
+            self.indexes[field] = {
+                getattr(obj, field): obj for obj in rows.values()}
+        return self.indexes[field].get(value)
+
+    def invalidate(self):
+        cache.set(self.version_key, uuid4().hex, timeout=None)
+
+
+categories = LookupTable(Category)
+locations = LookupTable(Location)
+
+
+def published_category(slug):
+    category = categories.find('slug', slug)
+    return category if category and category.is_published else None
+
+
+def warm_lookups():
+    categories.all()
+    locations.all()
+
+
+def attach_lookups(posts):
+    category_rows = categories.all()
+    location_rows = locations.all()
+    for post in posts:
+        if post.category_id in category_rows:
+            post.category = category_rows[post.category_id]
+        if post.location_id in location_rows:
+            post.location = location_rows[post.location_id]
+    return posts
@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from blog.feed import post_feed
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает пропускную способность JSON API и HTML-страниц '
+            'на текущих данных. Кэш страниц и debug toolbar отключаются, '
+            'чтобы каждый запрос обрабатывался целиком.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument(
+            '--fields', default='id,title,pub_date',
+            help='Поля для запросов к API с проекцией.')
+
+    def handle(self, *args, **options):
+        post = post_feed().select_related('category').first()
+        if post is None:
+            raise CommandError('Нет опубликованных постов для замера.')
+        fields = f'?fields={options["fields"]}'
+        pairs = [
+            ('лента', reverse('blog:index'), reverse('blog:api_posts')),
+            ('категория',
+             reverse('blog:category_posts', args=[post.category.slug]),
+             reverse('blog:api_category_posts', args=[post.category.slug])),
+            ('профиль',
+             reverse('blog:profile', args=[post.author.username]),
+             reverse('blog:api_profile_posts', args=[post.author.username])),
+            ('пост', post.get_absolute_url(),
+             reverse('blog:api_post_detail', args=[post.pk])),
+        ]
+        client = Client(SERVER_NAME='localhost')
+        with override_settings(PAGE_CACHE_TIMEOUT=0, INTERNAL_IPS=[]):
+            for name, html_url, api_url in pairs:
+                html = self.measure(client, html_url, options['requests'])
+                api = self.measure(client, api_url, options['requests'])
+                sparse = self.measure(
+                    client, api_url + fields, options['requests'])
+                self.stdout.write(
+                    f'{name}: HTML {html[0]:.0f} запр/с ({html[1]} Б), '
+                    f'API {api[0]:.0f} запр/с ({api[1]} Б), '
+                    f'API{fields} {sparse[0]:.0f} запр/с ({sparse[1]} Б), '
+                    f'×{api[0] / html[0]:.1f}')
+
+    def measure(self, client, url, requests):
+        response = client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f'{url} вернул {response.status_code}.')
+        start = time.perf_counter()
+        for _ in range(requests):
+            client.get(url)
+        return requests / (time.perf_counter() - start), len(response.content)
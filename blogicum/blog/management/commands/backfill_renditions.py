@@ -0,0 +1,39 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand
+
+from blog.images import generate_renditions, has_renditions
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные варианты для уже загруженных изображений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None)
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Пересоздать варианты, даже если они уже есть.')
+
+    def handle(self, *args, **options):
+        names = Post.objects.exclude(image='').values_list(
+            'image', flat=True).distinct().iterator()
+        processed = failed = 0
+        with ProcessPoolExecutor(
+                max_workers=options['workers'],
+                initializer=django.setup) as pool:
+            futures = {
+                pool.submit(generate_renditions, name): name
+                for name in names
+                if options['force'] or not has_renditions(name)
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    processed += 1
+                except Exception as error:
+                    failed += 1
+                    self.stderr.write(f'{futures[future]}: {error}')
+        self.stdout.write(
+            f'Обработано изображений: {processed}, с ошибками: {failed}')
@@ -0,0 +1,195 @@
+import json
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import chain
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import DateField, DateTimeField
+from django.utils import timezone
+
+from blog.models import Comment, Post, User
+from blog.search import fts_available
+
+CHUNK_SIZE = 1 << 16
+
+
+def iter_json_array(stream):
+    decoder = json.JSONDecoder()
+    buffer = ''
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        buffer += chunk
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,[':
+                pos += 1
+            if buffer[pos:pos + 1] == ']':
+                return
+            try:
+                obj, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break
+            yield obj
+        buffer = buffer[pos:]
+        if not chunk:
+            if buffer.strip():
+                raise CommandError('Фикстура обрывается на середине объекта.')
+            return
+
+
+def iter_ndjson(stream):
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+@contextmanager
+def fixture_timestamps(model, objs):
+    # bulk_create вызывает pre_save, и auto_now/auto_now_add заменили бы
+    # даты из фикстуры временем загрузки. На время вставки флаги
+    # снимаются; пустые значения заполняются текущим временем.
+    fields = [
+        field for field in model._meta.concrete_fields
+        if isinstance(field, DateField)
+        and (field.auto_now or field.auto_now_add)]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    now = timezone.now()
+    for field in fields:
+        for obj in objs:
+            if getattr(obj, field.attname) is None:
+                setattr(obj, field.attname, now)
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def python_value(field, value):
+    if isinstance(field, DateTimeField) and isinstance(value, str):
+        # fromisoformat() на порядок быстрее parse_datetime(), а даты
+        # из dumpdata и generate_dataset записаны в ISO 8601.
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    if field.is_relation and value is not None:
+        target = field.remote_field.model._meta.get_field(
+            field.remote_field.field_name or 'pk')
+        return target.to_python(value)
+    return field.to_python(value)
+
+
+def iter_records(stream):
+    head = stream.read(1)
+    while head.isspace():
+        head = stream.read(1)
+    if head == '[':
+        return iter_json_array(stream)
+    return iter_ndjson(chain([head + stream.readline()], stream))
+
+
+class Command(BaseCommand):
+    help = ('Загружает большую фикстуру JSON или NDJSON пакетами '
+            'bulk_create в одной транзакции.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixture')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--ignore-conflicts', action='store_true',
+            help='Пропускать записи, которые уже есть в базе.')
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.ignore_conflicts = options['ignore_conflicts']
+        self.pending = defaultdict(list)
+        self.m2m = defaultdict(list)
+        self.loaded = defaultdict(int)
+        self.schemas = {}
+        with open(options['fixture'], encoding='utf-8') as stream, \
+                transaction.atomic():
+            for record in iter_records(stream):
+                self.add(record)
+            for model in list(self.pending):
+                self.flush(model)
+            self.flush_m2m()
+            self.reset_sequences()
+        if self.loaded[Comment]:
+            call_command('recount_comments', batch_size=self.batch_size)
+        if self.loaded[User] or self.loaded[Post] or self.loaded[Comment]:
+            call_command('recount_author_stats', batch_size=self.batch_size)
+        if self.loaded[Post] and fts_available():
+            call_command('rebuild_search_index')
+        cache.clear()
+        for model, count in self.loaded.items():
+            self.stdout.write(f'{model._meta.label}: {count}')
+
+    def schema(self, label):
+        if label not in self.schemas:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError):
+                raise CommandError(f'Неизвестная модель в фикстуре: {label}.')
+            self.schemas[label] = (
+                model, model._meta.concrete_fields, model._meta.many_to_many)
+        return self.schemas[label]
+
+    def add(self, record):
+        # Объекты собираются напрямую, без serializers.deserialize() на
+        # каждую запись: значения приводятся так же, через to_python(),
+        # и передаются в конструктор по порядку полей.
+        model, fields, m2m_fields = self.schema(record['model'])
+        data = record['fields']
+        values = []
+        for field in fields:
+            if field.primary_key:
+                values.append(field.to_python(record.get('pk')))
+            elif field.name in data:
+                values.append(python_value(field, data[field.name]))
+            else:
+                values.append(field.get_default())
+        obj = model(*values)
+        self.pending[model].append(obj)
+        for field in m2m_fields:
+            if field.name in data:
+                self.m2m[field.remote_field.through].extend(
+                    (obj.pk, python_value(field, value))
+                    for value in data[field.name])
+        if len(self.pending[model]) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model):
+        objs = self.pending.pop(model, [])
+        with fixture_timestamps(model, objs):
+            model.objects.bulk_create(
+                objs, batch_size=self.batch_size,
+                ignore_conflicts=self.ignore_conflicts)
+        self.loaded[model] += len(objs)
+
+    def flush_m2m(self):
+        for through, rows in self.m2m.items():
+            source, target = [
+                field for field in through._meta.fields
+                if field.is_relation
+            ]
+            objs = [
+                through(**{source.attname: source_pk,
+                           target.attname: target_pk})
+                for source_pk, target_pk in rows
+            ]
+            through.objects.bulk_create(
+                objs, batch_size=self.batch_size, ignore_conflicts=True)
+
+    def reset_sequences(self):
+        statements = connection.ops.sequence_reset_sql(
+            self.style, list(self.loaded))
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
@@ -0,0 +1,47 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.conditional import latest_queryset
+from blog.feed import author_feed, category_feed, post_feed
+from blog.models import Category, Post, User
+
+FULL_SCAN = re.compile(
+    r'\bSCAN (?:TABLE )?(\w+)\b(?! USING)|Seq Scan on (\w+)')
+
+
+class Command(BaseCommand):
+    help = ('Выводит план выполнения запросов ленты, категории и профиля '
+            'и завершается с ошибкой при полном сканировании таблицы.')
+
+    def handle(self, *args, **options):
+        author = User(pk=0)
+        category = Category(pk=0)
+        querysets = {
+            'index': post_feed(),
+            'category_posts': category_feed(category),
+            'profile': author_feed(author),
+            'profile (owner)': author_feed(author, author),
+            'index last-modified': latest_queryset(
+                Post.objects.all(), 'updated_at'),
+            'index last-published': latest_queryset(post_feed(), 'pub_date'),
+            'category last-modified': latest_queryset(
+                Post.objects.filter(category=category), 'updated_at'),
+            'profile last-modified': latest_queryset(
+                Post.objects.filter(author__username=''), 'updated_at'),
+        }
+        failed = []
+        for name, queryset in querysets.items():
+            plan = queryset.explain()
+            self.stdout.write(f'{name}:\n{plan}\n')
+            scans = [
+                table for match in FULL_SCAN.finditer(plan)
+                for table in match.groups() if table
+            ]
+            if scans:
+                failed.append(f'{name} ({", ".join(scans)})')
+        if failed:
+            raise CommandError(
+                'Полное сканирование таблицы: ' + '; '.join(failed))
+        self.stdout.write(
+            self.style.SUCCESS('Все запросы используют индексы.'))
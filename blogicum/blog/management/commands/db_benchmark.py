@@ -0,0 +1,88 @@
+import random
+import threading
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from blog.feed import post_feed
+from blog.models import Category, Comment, Post, User
+
+
+class Command(BaseCommand):
+    help = ('Нагружает базу данных смешанными чтениями и записями из '
+            'нескольких потоков и выводит пропускную способность, '
+            'задержки и число ошибок. Созданные данные удаляются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=10)
+        parser.add_argument(
+            '--write-share', type=float, default=0.2,
+            help='Доля операций записи (новых комментариев).')
+        parser.add_argument('--posts', type=int, default=200)
+
+    def handle(self, *args, **options):
+        author = User.objects.create(username='db_benchmark')
+        category = Category.objects.create(
+            title='Бенчмарк', description='', slug='db-benchmark')
+        Post.objects.bulk_create(
+            Post(title=f'Пост {i}', text='Текст', author=author,
+                 category=category)
+            for i in range(options['posts']))
+        self.post_ids = list(
+            Post.objects.filter(author=author).values_list('pk', flat=True))
+        self.author = author
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        deadline = time.monotonic() + options['duration']
+        threads = [
+            threading.Thread(
+                target=self.work, args=(deadline, options['write_share']))
+            for _ in range(options['threads'])
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            author.delete()
+            category.delete()
+        self.report(options['duration'])
+
+    def work(self, deadline, write_share):
+        try:
+            while time.monotonic() < deadline:
+                kind = 'write' if random.random() < write_share else 'read'
+                start = time.perf_counter()
+                try:
+                    if kind == 'write':
+                        Comment.objects.create(
+                            post_id=random.choice(self.post_ids),
+                            author=self.author, text='Комментарий')
+                    else:
+                        list(post_feed()[:10])
+                except Exception as error:
+                    with self.lock:
+                        self.errors[f'{kind}: {error}'] += 1
+                    continue
+                with self.lock:
+                    self.latencies[kind].append(time.perf_counter() - start)
+        finally:
+            connection.close()
+
+    def report(self, duration):
+        self.stdout.write(f'База: {connection.vendor}')
+        for kind, latencies in sorted(self.latencies.items()):
+            latencies.sort()
+            count = len(latencies)
+            self.stdout.write(
+                f'{kind}: {count / duration:.0f} оп/с, '
+                f'p50={latencies[count // 2] * 1000:.1f} мс, '
+                f'p95={latencies[int(count * 0.95)] * 1000:.1f} мс, '
+                f'max={latencies[-1] * 1000:.1f} мс')
+        for error, count in self.errors.items():
+            self.stderr.write(f'{count} × {error}')
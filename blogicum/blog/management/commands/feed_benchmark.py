@@ -0,0 +1,71 @@
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Category, Location, Post, User
+from blog.views import PostListView
+
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = ('Замеряет число запросов и время отрисовки страниц ленты '
+            'на синтетических данных; данные откатываются после замера.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', nargs='+', type=int,
+            default=[10_000, 100_000, 1_000_000])
+        parser.add_argument('--pages', nargs='+', type=int, default=[1, 10])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        factory = RequestFactory(SERVER_NAME='localhost')
+        with transaction.atomic():
+            author = User.objects.create(username='feed_benchmark')
+            category = Category.objects.create(
+                title='Бенчмарк', description='', slug='feed-benchmark')
+            location = Location.objects.create(title='Бенчмарк')
+            created = 0
+            for size in sorted(options['sizes']):
+                created = self.seed(
+                    created, size, author, category, location)
+                for page in options['pages']:
+                    self.measure(factory, size, page, options['repeat'])
+            transaction.set_rollback(True)
+
+    def seed(self, created, size, author, category, location):
+        now = timezone.now()
+        while created < size:
+            batch = min(BATCH_SIZE, size - created)
+            Post.objects.bulk_create(
+                Post(
+                    title=f'Пост {created + i}',
+                    text='Текст',
+                    pub_date=now - timezone.timedelta(minutes=created + i),
+                    author=author,
+                    category=category,
+                    location=location,
+                ) for i in range(batch)
+            )
+            created += batch
+        return created
+
+    def measure(self, factory, size, page, repeat):
+        timings = []
+        for _ in range(repeat):
+            request = factory.get('/', {'page': page})
+            request.user = AnonymousUser()
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                PostListView.as_view()(request).render()
+                timings.append(time.perf_counter() - start)
+        self.stdout.write(
+            f'posts={size} page={page} queries={len(queries)} '
+            f'best={min(timings) * 1000:.1f}ms '
+            f'avg={sum(timings) / len(timings) * 1000:.1f}ms')
@@ -0,0 +1,139 @@
+import json
+import random
+import sys
+from datetime import timedelta
+from itertools import accumulate
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+WORDS = (
+    'день утро вечер город море лес кот собака дорога поезд книга кофе '
+    'дождь солнце снег друг работа отпуск концерт рынок парк мост река'
+).split()
+
+
+def zipf_weights(n, exponent):
+    return list(accumulate(1 / rank ** exponent for rank in range(1, n + 1)))
+
+
+class Command(BaseCommand):
+    help = ('Генерирует синтетический набор данных в формате NDJSON '
+            'для команды bulkload: пользователи, категории, места, '
+            'публикации и комментарии с неравномерным распределением.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=int, default=10_000,
+            help='Количество публикаций.')
+        parser.add_argument('--comments-per-post', type=float, default=3)
+        parser.add_argument('--posts-per-user', type=int, default=50)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=100)
+        parser.add_argument('--future-share', type=float, default=0.01)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', default='-')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.now = timezone.now()
+        n_posts = options['scale']
+        n_users = max(1, n_posts // options['posts_per_user'])
+        n_comments = int(n_posts * options['comments_per_post'])
+        output = (
+            sys.stdout if options['output'] == '-'
+            else open(options['output'], 'w', encoding='utf-8'))
+        self.write = lambda model, pk, fields: output.write(json.dumps(
+            {'model': model, 'pk': pk, 'fields': fields},
+            ensure_ascii=False) + '\n')
+        try:
+            self.users(n_users)
+            self.categories(options['categories'])
+            self.locations(options['locations'])
+            self.posts_and_comments(
+                n_posts, n_users, n_comments,
+                options['categories'], options['locations'],
+                options['future_share'])
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+    def text(self, n_words):
+        return ' '.join(self.random.choices(WORDS, k=n_words)).capitalize()
+
+    def date(self, days_back):
+        return (self.now - timedelta(
+            seconds=self.random.randint(0, days_back * 86400))).isoformat()
+
+    def users(self, count):
+        for pk in range(1, count + 1):
+            self.write('auth.user', pk, {
+                'username': f'user{pk}',
+                'password': '!',
+                'email': f'user{pk}@example.com',
+                'date_joined': self.date(1000),
+            })
+
+    def categories(self, count):
+        for pk in range(1, count + 1):
+            self.write('blog.category', pk, {
+                'title': self.text(2),
+                'description': self.text(12),
+                'slug': f'category-{pk}',
+                'is_published': self.random.random() > 0.1,
+                'created_at': self.date(1000),
+            })
+
+    def locations(self, count):
+        for pk in range(1, count + 1):
+            self.write('blog.location', pk, {
+                'title': self.text(2),
+                'is_published': self.random.random() > 0.1,
+                'created_at': self.date(1000),
+            })
+
+    def posts_and_comments(self, n_posts, n_users, n_comments,
+                           n_categories, n_locations, future_share):
+        authors = self.random.choices(
+            range(1, n_users + 1),
+            cum_weights=zipf_weights(n_users, 1.1), k=n_posts)
+        commented = self.random.choices(
+            range(n_posts), cum_weights=zipf_weights(n_posts, 0.8),
+            k=n_comments)
+        comment_counts = [0] * n_posts
+        for index in commented:
+            comment_counts[index] += 1
+        self.random.shuffle(comment_counts)
+        category_weights = zipf_weights(n_categories, 1.0)
+        comment_pk = 1
+        for index in range(n_posts):
+            pk = index + 1
+            if self.random.random() < future_share:
+                pub_date = (self.now + timedelta(
+                    seconds=self.random.randint(60, 30 * 86400)))
+            else:
+                pub_date = self.now - timedelta(
+                    seconds=self.random.randint(0, 700 * 86400))
+            self.write('blog.post', pk, {
+                'title': self.text(4),
+                'text': self.text(self.random.randint(20, 200)),
+                'pub_date': pub_date.isoformat(),
+                'author': authors[index],
+                'category': self.random.choices(
+                    range(1, n_categories + 1),
+                    cum_weights=category_weights)[0],
+                'location': self.random.randint(1, n_locations),
+                'is_published': self.random.random() > 0.05,
+                'comment_count': comment_counts[index],
+                'created_at': pub_date.isoformat(),
+                'updated_at': pub_date.isoformat(),
+            })
+            for _ in range(comment_counts[index]):
+                self.write('blog.comment', comment_pk, {
+                    'text': self.text(self.random.randint(3, 40)),
+                    'post': pk,
+                    'author': self.random.randint(1, n_users),
+                    'created_at': (pub_date + timedelta(
+                        seconds=self.random.randint(60, 86400))).isoformat(),
+                })
+                comment_pk += 1
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import post_card_stats
+
+
+class Command(BaseCommand):
+    help = 'Показывает статистику кэша карточек публикаций.'
+
+    def handle(self, *args, **options):
+        stats = post_card_stats()
+        self.stdout.write(
+            'Попаданий: {hits}, промахов: {misses}, '
+            'средняя отрисовка: {avg_render_ms:.2f} мс, '
+            'сэкономлено: {saved_ms:.0f} мс'.format(**stats))
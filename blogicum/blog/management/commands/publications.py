@@ -0,0 +1,67 @@
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.cache import post_page_groups, purge_pages, refresh_next_publication
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = ('Показывает отложенные публикации. С --warm дожидается выхода '
+            'публикаций в пределах --within секунд и прогревает кэш '
+            'затронутых страниц; для этого нужен общий с сервером кэш.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--warm', action='store_true')
+        parser.add_argument('--within', type=int, default=60)
+
+    def handle(self, *args, **options):
+        if options['warm'] and isinstance(
+                caches['default'], (LocMemCache, DummyCache)):
+            # Такой кэш живёт в памяти процесса команды, а не сервера:
+            # прогревать его бесполезно.
+            raise CommandError(
+                '--warm работает только с общим для сервера кэшем '
+                '(Redis, Memcached, база данных или файлы).')
+        upcoming = list(
+            Post.objects.select_related('author', 'category').filter(
+                is_published=True, pub_date__gt=timezone.now()
+            ).order_by('pub_date')[:options['limit']])
+        for post in upcoming:
+            self.stdout.write(
+                f'{timezone.localtime(post.pub_date):%Y-%m-%d %H:%M:%S} '
+                f'#{post.pk} «{post}» @{post.author.username} '
+                f'[{post.category.slug if post.category else "-"}]')
+        if not upcoming:
+            self.stdout.write('Отложенных публикаций нет.')
+        if options['warm']:
+            deadline = timezone.now() + timezone.timedelta(
+                seconds=options['within'])
+            for post in upcoming:
+                if post.pub_date > deadline:
+                    break
+                self.warm(post)
+
+    def warm(self, post):
+        delay = (post.pub_date - timezone.now()).total_seconds()
+        if delay > 0:
+            time.sleep(delay)
+        refresh_next_publication()
+        purge_pages(*post_page_groups([post.pk]))
+        client = Client(SERVER_NAME='localhost')
+        urls = [reverse('blog:index'), post.get_absolute_url()]
+        if post.category:
+            urls.append(reverse(
+                'blog:category_posts', args=[post.category.slug]))
+        for url in urls:
+            response = client.get(url)
+            if response.status_code != 200:
+                raise CommandError(f'{url} вернул {response.status_code}.')
+        self.stdout.write(f'Прогрет кэш для #{post.pk}: {", ".join(urls)}')
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.search import fts_available, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс публикаций (SQLite FTS5).'
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            raise CommandError(
+                'Полнотекстовый индекс поддерживается только для SQLite.')
+        self.stdout.write(f'Проиндексировано публикаций: {rebuild_index()}')
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max, Q
+
+from blog.models import AuthorStats, Comment, Post, User
+
+FIELDS = (
+    'post_count', 'listed_post_count', 'comment_count', 'latest_pub_date')
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённую статистику авторов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        fixed = 0
+        last_pk = 0
+        while True:
+            user_ids = list(
+                User.objects.filter(pk__gt=last_pk).order_by('pk').values_list(
+                    'pk', flat=True)[:batch_size])
+            if not user_ids:
+                break
+            last_pk = user_ids[-1]
+            posts = {
+                row['author_id']: row
+                for row in Post.objects.filter(
+                    author_id__in=user_ids
+                ).order_by().values('author_id').annotate(
+                    total=Count('pk'),
+                    listed=Count('pk', filter=Q(
+                        is_published=True, category__is_published=True)),
+                    latest=Max('pub_date', filter=Q(is_published=True)),
+                )
+            }
+            comments = dict(
+                Comment.objects.filter(
+                    post__author_id__in=user_ids
+                ).order_by().values_list('post__author_id').annotate(
+                    Count('pk')))
+            stored = AuthorStats.objects.in_bulk(user_ids)
+            missing, stale = [], []
+            for user_id in user_ids:
+                row = posts.get(user_id, {})
+                actual = AuthorStats(
+                    user_id=user_id,
+                    post_count=row.get('total', 0),
+                    listed_post_count=row.get('listed', 0),
+                    comment_count=comments.get(user_id, 0),
+                    latest_pub_date=row.get('latest'),
+                )
+                current = stored.get(user_id)
+                if current is None:
+                    missing.append(actual)
+                elif any(getattr(current, field) != getattr(actual, field)
+                         for field in FIELDS):
+                    stale.append(actual)
+            with transaction.atomic():
+                AuthorStats.objects.bulk_create(missing)
+                AuthorStats.objects.bulk_update(stale, FIELDS)
+            fixed += len(missing) + len(stale)
+        self.stdout.write(f'Исправлено авторов: {fixed}')
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённое количество комментариев у публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        fixed = 0
+        last_pk = 0
+        while True:
+            posts = list(
+                Post.objects.filter(pk__gt=last_pk).order_by('pk').only(
+                    'pk', 'comment_count')[:batch_size])
+            if not posts:
+                break
+            last_pk = posts[-1].pk
+            counts = dict(
+                Comment.objects.filter(
+                    post_id__in=[post.pk for post in posts]
+                ).order_by().values_list('post_id').annotate(Count('pk')))
+            stale = []
+            for post in posts:
+                actual = counts.get(post.pk, 0)
+                if post.comment_count != actual:
+                    post.comment_count = actual
+                    stale.append(post)
+            with transaction.atomic():
+                Post.objects.bulk_update(stale, ['comment_count'])
+            fixed += len(stale)
+        self.stdout.write(f'Исправлено публикаций: {fixed}')
@@ -0,0 +1,45 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from blog.jobs import claim_job, run_job
+from blog.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди в базе данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=2)
+        parser.add_argument('--poll-interval', type=float, default=1.0)
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить накопившиеся задачи и завершиться.')
+
+    def handle(self, *args, **options):
+        self.options = options
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            workers = [
+                pool.submit(self.work)
+                for _ in range(options['concurrency'])
+            ]
+            for worker in workers:
+                worker.result()
+
+    def work(self):
+        try:
+            while True:
+                close_old_connections()
+                job = claim_job()
+                if job is None:
+                    if self.options['once']:
+                        return
+                    time.sleep(self.options['poll_interval'])
+                    continue
+                job = run_job(job)
+                log = self.stdout if job.status == Job.DONE else self.stderr
+                log.write(f'{job}: {job.get_status_display()}')
+        finally:
+            connection.close()
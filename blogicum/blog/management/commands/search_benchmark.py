@@ -0,0 +1,61 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from blog.feed import post_feed
+from blog.search import fts_available
+
+TARGET_MS = 50
+
+
+class Command(BaseCommand):
+    help = ('Замеряет время ответа страницы поиска на текущих данных '
+            f'и сравнивает его с целью в {TARGET_MS} мс. Кэш страниц '
+            'и debug toolbar отключаются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('queries', nargs='*')
+        parser.add_argument('--requests', type=int, default=50)
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            raise CommandError(
+                'Полнотекстовый индекс поддерживается только для SQLite.')
+        queries = options['queries'] or self.sample_queries()
+        client = Client(SERVER_NAME='localhost')
+        url = reverse('blog:search')
+        slow = 0
+        with override_settings(PAGE_CACHE_TIMEOUT=0, INTERNAL_IPS=[]):
+            for query in queries:
+                timings = self.measure(
+                    client, url, query, options['requests'])
+                median = statistics.median(timings)
+                p95 = statistics.quantiles(timings, n=20)[-1]
+                slow += p95 > TARGET_MS
+                self.stdout.write(
+                    f'«{query}»: медиана {median:.1f} мс, '
+                    f'95-й перцентиль {p95:.1f} мс')
+        verdict = (f'Цель {TARGET_MS} мс превышена в {slow} запросах.'
+                   if slow else f'Все запросы укладываются в {TARGET_MS} мс.')
+        self.stdout.write(verdict)
+
+    def sample_queries(self):
+        post = post_feed().first()
+        if post is None:
+            raise CommandError('Нет опубликованных постов для замера.')
+        words = post.title.split() + post.text.split()
+        return [words[0], ' '.join(words[:2]), words[-1]]
+
+    def measure(self, client, url, query, requests):
+        response = client.get(url, {'q': query})
+        if response.status_code != 200:
+            raise CommandError(f'{url} вернул {response.status_code}.')
+        timings = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            client.get(url, {'q': query})
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
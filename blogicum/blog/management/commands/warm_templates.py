@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from blog.warmup import cached_loaders, django_engines, warm_templates
+
+
+class Command(BaseCommand):
+    help = ('Компилирует все шаблоны из каталогов TEMPLATES и выводит '
+            'время компиляции каждого, от самых медленных.')
+
+    def handle(self, *args, **options):
+        if not any(cached_loaders(engine) for engine in django_engines()):
+            self.stderr.write(
+                'Кэширующий загрузчик шаблонов не включён: шаблоны будут '
+                'компилироваться заново при каждом запросе.')
+        timings = warm_templates(reset=True)
+        for name, seconds in sorted(timings, key=lambda item: -item[1]):
+            self.stdout.write(f'{seconds * 1000:8.2f} мс  {name}')
+        self.stdout.write(
+            f'Всего: {len(timings)} шаблонов, '
+            f'{sum(seconds for _, seconds in timings) * 1000:.1f} мс')
@@ -0,0 +1,63 @@
+# Generated by Django 3.2.16 on 2026-10-18 17:30
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def total(queryset):
+    return Coalesce(Subquery(
+        queryset.order_by().values('author').annotate(
+            total=Count('pk')).values('total')), Value(0))
+
+
+def fill_author_stats(apps, schema_editor):
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    AuthorStats = apps.get_model('blog', 'AuthorStats')
+    Post = apps.get_model('blog', 'Post')
+    Comment = apps.get_model('blog', 'Comment')
+    AuthorStats.objects.bulk_create(
+        [AuthorStats(user_id=pk)
+         for pk in User.objects.values_list('pk', flat=True)],
+        batch_size=1000)
+    posts = Post.objects.filter(author=OuterRef('user'))
+    AuthorStats.objects.update(
+        post_count=total(posts),
+        listed_post_count=total(posts.filter(
+            is_published=True, category__is_published=True)),
+        comment_count=Coalesce(Subquery(
+            Comment.objects.filter(post__author=OuterRef('user')).order_by(
+            ).values('post__author').annotate(
+                total=Count('pk')).values('total')), Value(0)),
+        latest_pub_date=Subquery(
+            posts.filter(is_published=True).order_by(
+                '-pub_date').values('pub_date')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0025_post_updated_at_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Публикаций')),
+                ('listed_post_count', models.PositiveIntegerField(default=0, verbose_name='Опубликованных в открытых категориях')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Комментариев к публикациям')),
+                ('latest_pub_date', models.DateTimeField(blank=True, null=True, verbose_name='Дата последней публикации')),
+            ],
+            options={
+                'verbose_name': 'статистика автора',
+                'verbose_name_plural': 'Статистика авторов',
+            },
+        ),
+        migrations.RunPython(fill_author_stats, migrations.RunPython.noop),
+    ]
@@ -62,11 +62,36 @@ class Post(PublishedModel):
         on_delete=models.SET_NULL,
         null=True,
         verbose_name='Категория')
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев', default=0, editable=False)
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         default_related_name = 'posts'
+        indexes = (
+            models.Index(
+                fields=('-pub_date',),
+                condition=models.Q(is_published=True),
+                name='post_published_feed_idx'),
+            models.Index(
+                fields=('category', '-pub_date'),
+                condition=models.Q(is_published=True),
+                name='post_published_category_idx'),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_pub_date_idx'),
+            models.Index(
+                fields=('-updated_at',),
+                name='post_updated_at_idx'),
+            models.Index(
+                fields=('category', '-updated_at'),
+                name='post_category_updated_at_idx'),
+            models.Index(
+                fields=('author', '-updated_at'),
+                name='post_author_updated_at_idx'),
+        )
 
     def __str__(self):
         return self.title[:20]
@@ -91,8 +116,74 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_at_idx'),
+        )
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
 
     def __str__(self):
         return self.text[:20]
+
+
+class Job(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнено'),
+        (FAILED, 'Ошибка'),
+    )
+
+    task = models.CharField('Задача', max_length=MAX_LENGTH_64)
+    payload = models.JSONField('Параметры', default=dict)
+    status = models.CharField(
+        'Статус', max_length=16, choices=STATUSES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    max_attempts = models.PositiveSmallIntegerField(
+        'Максимум попыток', default=5)
+    run_after = models.DateTimeField('Не раньше', default=timezone.now)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
+
+    class Meta:
+        ordering = ('id',)
+        indexes = (
+            models.Index(
+                fields=('status', 'run_after'),
+                name='job_status_run_after_idx'),
+        )
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+
+    def __str__(self):
+        return f'{self.task} #{self.pk}'
+
+
+class AuthorStats(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Пользователь')
+    post_count = models.PositiveIntegerField('Публикаций', default=0)
+    listed_post_count = models.PositiveIntegerField(
+        'Опубликованных в открытых категориях', default=0)
+    comment_count = models.PositiveIntegerField(
+        'Комментариев к публикациям', default=0)
+    latest_pub_date = models.DateTimeField(
+        'Дата последней публикации', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+    def __str__(self):
+        return str(self.user_id)
@@ -0,0 +1,166 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+from .constants import COMMENTS_PER_PAGE, POSTS_PER_PAGE
+from .lookups import attach_lookups
+
+
+def encode_cursor(obj, field='pub_date'):
+    value = f'{getattr(obj, field).isoformat()}|{obj.pk}'
+    return urlsafe_b64encode(value.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        value, pk = urlsafe_b64decode(padded).decode().split('|')
+        return datetime.fromisoformat(value), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+class KeysetPage:
+    is_keyset = True
+
+    def __init__(self, object_list, paginator, has_newer, has_older):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.has_newer = has_newer
+        self.has_older = has_older
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.has_older
+
+    def has_previous(self):
+        return self.has_newer
+
+    def has_other_pages(self):
+        return self.has_newer or self.has_older
+
+    @property
+    def newer_cursor(self):
+        if self.has_newer and self.object_list:
+            return self.paginator.encode(self.object_list[0])
+        return None
+
+    @property
+    def older_cursor(self):
+        if self.has_older and self.object_list:
+            return self.paginator.encode(self.object_list[-1])
+        return None
+
+
+class KeysetPaginator:
+    def __init__(self, feed, per_page, field='pub_date',
+                 count_limit=None, count=None):
+        # feed(now) строит выдачу с верхней границей now: страница по
+        # курсору подставляет его значение вместо текущего времени.
+        self.feed = feed
+        self.per_page = per_page
+        self.field = field
+        self.count_limit = count_limit
+        self.count = count
+
+    @property
+    def queryset(self):
+        return self.feed(None).order_by(f'-{self.field}', '-pk')
+
+    def encode(self, obj):
+        return encode_cursor(obj, self.field)
+
+    def get_page(self, params):
+        older = decode_cursor(params.get('after', ''))
+        newer = decode_cursor(params.get('before', ''))
+        if newer and not older:
+            return self._newer_page(*newer)
+        if older:
+            return self._older_page(*older)
+        objects = list(self.queryset[:self.per_page + 1])
+        return KeysetPage(
+            objects[:self.per_page], self, False,
+            len(objects) > self.per_page)
+
+    def _older_page(self, value, pk):
+        # Курсор должен быть единственной верхней границей по индексу:
+        # условие с OR SQLite границей не считает и перебирает строки
+        # до курсора, так что страница дорожала бы с глубиной.
+        objects = list(self.feed(value).filter(
+            **{f'{self.field}__lte': value}
+        ).exclude(
+            **{self.field: value, 'pk__gte': pk}
+        ).order_by(f'-{self.field}', '-pk')[:self.per_page + 1])
+        return KeysetPage(
+            objects[:self.per_page], self, True,
+            len(objects) > self.per_page)
+
+    def _newer_page(self, value, pk):
+        objects = list(self.feed(None).filter(
+            **{f'{self.field}__gte': value}
+        ).exclude(
+            **{self.field: value, 'pk__lte': pk}
+        ).order_by(self.field, 'pk')[:self.per_page + 1])
+        has_newer = len(objects) > self.per_page
+        return KeysetPage(
+            objects[:self.per_page][::-1], self, has_newer, True)
+
+    @cached_property
+    def _limited_count(self):
+        if self.count_limit is None:
+            return None
+        if self.count is not None:
+            return self.count
+        return self.queryset.order_by()[:self.count_limit + 1].count()
+
+    @property
+    def approximate_count(self):
+        if self._limited_count is None:
+            return None
+        return min(self._limited_count, self.count_limit)
+
+    @property
+    def count_is_capped(self):
+        return (self._limited_count is not None
+                and self._limited_count > self.count_limit)
+
+
+def paginate_posts(request, feed, per_page=POSTS_PER_PAGE, count=None):
+    if settings.POSTS_PAGINATION == 'keyset':
+        paginator = KeysetPaginator(
+            feed, per_page,
+            count_limit=settings.POSTS_APPROXIMATE_COUNT_LIMIT, count=count)
+        page_obj = paginator.get_page(request.GET)
+    else:
+        paginator = Paginator(feed(None), per_page)
+        if count is not None:
+            # Известное заранее число записей избавляет от COUNT(*).
+            paginator.count = count
+        page_obj = paginator.get_page(request.GET.get('page'))
+    page_obj.object_list = attach_lookups(list(page_obj.object_list))
+    return page_obj
+
+
+def comment_batch(queryset, token='', per_page=COMMENTS_PER_PAGE):
+    queryset = queryset.order_by('created_at', 'pk')
+    cursor = decode_cursor(token)
+    if cursor:
+        created_at, pk = cursor
+        queryset = queryset.filter(created_at__gte=created_at).exclude(
+            created_at=created_at, pk__lte=pk)
+    comments = list(queryset[:per_page + 1])
+    next_cursor = None
+    if len(comments) > per_page:
+        next_cursor = encode_cursor(comments[per_page - 1], 'created_at')
+    return comments[:per_page], next_cursor
@@ -0,0 +1,84 @@
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+SNIPPET_WORDS = 16
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+def fts_query(query):
+    terms = query.split()
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def index_post(post):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'DELETE FROM blog_post_fts WHERE rowid = %s', [post.pk])
+        cursor.execute(
+            'INSERT INTO blog_post_fts(rowid, title, text) '
+            'VALUES (%s, %s, %s)', [post.pk, post.title, post.text])
+
+
+def unindex_post(post_id):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'DELETE FROM blog_post_fts WHERE rowid = %s', [post_id])
+
+
+def rebuild_index():
+    with connection.cursor() as cursor:
+        cursor.execute('DELETE FROM blog_post_fts')
+        cursor.execute(
+            'INSERT INTO blog_post_fts(rowid, title, text) '
+            'SELECT id, title, text FROM blog_post')
+        cursor.execute(
+            "INSERT INTO blog_post_fts(blog_post_fts) VALUES ('optimize')")
+        cursor.execute('SELECT count(*) FROM blog_post_fts')
+        return cursor.fetchone()[0]
+
+
+def matching_ids(query):
+    return RawSQL(
+        'SELECT rowid FROM blog_post_fts WHERE blog_post_fts MATCH %s',
+        [fts_query(query)])
+
+
+def search_posts(queryset, query):
+    if not query.split():
+        return queryset.none()
+    if not fts_available():
+        return queryset.filter(
+            Q(title__icontains=query) | Q(text__icontains=query))
+    return queryset.extra(
+        tables=['blog_post_fts'],
+        where=[
+            'blog_post_fts.rowid = blog_post.id',
+            'blog_post_fts MATCH %s',
+        ],
+        params=[fts_query(query)],
+        select={
+            'rank': 'bm25(blog_post_fts)',
+            'snippet': 'snippet(blog_post_fts, -1, %s, %s, %s, %s)',
+        },
+        select_params=[SNIPPET_START, SNIPPET_END, '…', SNIPPET_WORDS],
+        order_by=['rank'],
+    )
+
+
+def highlight(snippet):
+    return mark_safe(
+        escape(snippet)
+        .replace(SNIPPET_START, '<mark>')
+        .replace(SNIPPET_END, '</mark>'))
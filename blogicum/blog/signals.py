@@ -0,0 +1,323 @@
+from functools import partial
+
+from asgiref.local import Local
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save)
+from django.db.models.functions import Greatest
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import (
+    invalidate_post_cards, post_page_groups, purge_pages,
+    refresh_next_publication)
+from .conditional import mark_content_changed
+from .jobs import enqueue
+from .lookups import categories, locations
+from .models import AuthorStats, Category, Comment, Location, Post, User
+from .search import index_post, unindex_post
+from .sitemaps import (
+    chunk_of, index_entry_current, invalidate_sitemap, is_listed)
+from .stats import (
+    adjust_author_stats, adjust_received_comments, listed,
+    recount_listed_posts)
+
+
+def after_commit(func, *args, **kwargs):
+    # Кэш сбрасывается после фиксации транзакции: иначе запрос, успевший
+    # между сбросом и фиксацией, сохранил бы в кэш прежние данные.
+    transaction.on_commit(partial(func, *args, **kwargs))
+
+
+# Посты, которые сейчас удаляются вместе с комментариями.
+_deleting = Local()
+
+
+def deleting_posts():
+    if not hasattr(_deleting, 'post_ids'):
+        _deleting.post_ids = set()
+    return _deleting.post_ids
+
+
+def comment_of_deleted_post(comment):
+    # Счётчики, статистику и кэш такого поста обработчики самого поста
+    # обновят один раз, а не на каждый каскадно удалённый комментарий.
+    return comment.post_id in deleting_posts()
+
+
+@receiver(pre_delete, sender=Post)
+def remember_deleted_post(sender, instance, **kwargs):
+    deleting_posts().add(instance.pk)
+    instance._original_comment_count = Post.objects.filter(
+        pk=instance.pk).values_list('comment_count', flat=True).first() or 0
+
+
+@receiver(post_delete, sender=Post)
+def forget_deleted_post(sender, instance, **kwargs):
+    deleting_posts().discard(instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    changes = {'updated_at': timezone.now()}
+    if created:
+        changes['comment_count'] = F('comment_count') + 1
+    Post.objects.filter(pk=instance.post_id).update(**changes)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    if comment_of_deleted_post(instance):
+        return
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=Greatest(F('comment_count') - 1, 0),
+        updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_card(sender, instance, **kwargs):
+    after_commit(invalidate_post_cards, [instance.pk])
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_commented_post_card(sender, instance, **kwargs):
+    if comment_of_deleted_post(instance):
+        return
+    after_commit(invalidate_post_cards, [instance.post_id])
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(pre_delete, sender=Location)
+def invalidate_related_post_cards(sender, instance, **kwargs):
+    after_commit(
+        invalidate_post_cards,
+        list(instance.posts.values_list('pk', flat=True)))
+
+
+@receiver(pre_save, sender=Post)
+def remember_original_post(sender, instance, **kwargs):
+    (instance._original_category_id, instance._original_image,
+     instance._original_is_published, instance._original_author_id,
+     instance._original_comment_count) = (
+        Post.objects.filter(pk=instance.pk).values_list(
+            'category_id', 'image', 'is_published', 'author_id',
+            'comment_count').first() or (None, '', False, None, 0))
+
+
+@receiver(post_save, sender=Post)
+def create_image_renditions(sender, instance, **kwargs):
+    if (instance.image
+            and instance.image.name != getattr(
+                instance, '_original_image', '')):
+        enqueue('process_image', name=instance.image.name)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def purge_post_pages(sender, instance, **kwargs):
+    category_ids = {
+        instance.category_id,
+        getattr(instance, '_original_category_id', None),
+    }
+    after_commit(purge_pages, *post_page_groups(
+        [instance.pk], category_ids, [instance.author_id]))
+    after_commit(refresh_next_publication)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def purge_commented_post_pages(sender, instance, **kwargs):
+    if comment_of_deleted_post(instance):
+        return
+    after_commit(purge_pages, *post_page_groups([instance.post_id]))
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_slug(sender, instance, **kwargs):
+    instance._original_slug, instance._original_is_published = (
+        Category.objects.filter(pk=instance.pk).values_list(
+            'slug', 'is_published').first() or (None, False))
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def purge_category_pages(sender, instance, **kwargs):
+    post_ids = list(instance.posts.values_list('pk', flat=True))
+    after_commit(
+        purge_pages,
+        'index',
+        f'category:{instance.slug}',
+        f'category:{getattr(instance, "_original_slug", None)}',
+        *(f'post:{post_id}' for post_id in post_ids),
+    )
+
+
+@receiver(post_save, sender=Location)
+@receiver(pre_delete, sender=Location)
+def purge_location_pages(sender, instance, **kwargs):
+    post_ids = list(instance.posts.values_list('pk', flat=True))
+    after_commit(purge_pages, *post_page_groups(post_ids))
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender, instance, **kwargs):
+    index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender, instance, **kwargs):
+    unindex_post(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, created, **kwargs):
+    now_listed = listed(instance.is_published, instance.category_id)
+    if created:
+        adjust_author_stats(instance.author_id, posts=1, listed=now_listed)
+        return
+    was_listed = listed(
+        instance._original_is_published, instance._original_category_id)
+    if instance._original_author_id == instance.author_id:
+        adjust_author_stats(
+            instance.author_id, listed=now_listed - was_listed)
+        return
+    comments = instance._original_comment_count
+    adjust_author_stats(
+        instance._original_author_id, posts=-1,
+        listed=-was_listed, comments=-comments)
+    adjust_author_stats(
+        instance.author_id, posts=1, listed=now_listed, comments=comments)
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    # Каскадно удалённые комментарии вычитаются здесь одним UPDATE.
+    adjust_author_stats(
+        instance.author_id, posts=-1,
+        listed=-listed(instance.is_published, instance.category_id),
+        comments=-instance._original_comment_count)
+
+
+@receiver(post_save, sender=Category)
+def recount_category_authors(sender, instance, created, **kwargs):
+    if not created and (
+            instance.is_published != instance._original_is_published):
+        recount_listed_posts(
+            instance.posts.order_by().values('author_id').distinct())
+
+
+@receiver(pre_delete, sender=Category)
+def remember_category_authors(sender, instance, **kwargs):
+    instance._author_ids = list(
+        instance.posts.order_by().values_list(
+            'author_id', flat=True).distinct())
+
+
+@receiver(post_delete, sender=Category)
+def recount_deleted_category_authors(sender, instance, **kwargs):
+    # Посты остаются без категории и пропадают из публичных списков.
+    recount_listed_posts(instance._author_ids)
+
+
+@receiver(post_save, sender=Comment)
+def count_added_comment(sender, instance, created, **kwargs):
+    if created:
+        adjust_received_comments(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    if comment_of_deleted_post(instance):
+        return
+    adjust_received_comments(instance.post_id, -1)
+
+
+@receiver(post_save, sender=User)
+def create_author_stats(sender, instance, created, **kwargs):
+    if created:
+        AuthorStats.objects.create(user=instance)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_lookups(sender, **kwargs):
+    after_commit(categories.invalidate)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_lookups(sender, **kwargs):
+    after_commit(locations.invalidate)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def mark_feeds_changed(sender, **kwargs):
+    after_commit(mark_content_changed)
+
+
+@receiver(post_save, sender=User)
+def mark_author_changed(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        after_commit(mark_content_changed)
+        after_commit(purge_pages, f'author:{instance.username}')
+
+
+@receiver(post_save, sender=Post)
+def invalidate_saved_post_sitemaps(sender, instance, **kwargs):
+    if not (instance.is_published or instance._original_is_published):
+        # Черновик не попадал в sitemap и не попадёт.
+        return
+    post_chunk = chunk_of(instance.pk)
+    profile_chunk = chunk_of(instance.author_id)
+    # Индекс пересчитывается, только если у фрагмента мог измениться
+    # lastmod или он мог появиться либо опустеть.
+    listed = is_listed(instance)
+    after_commit(invalidate_sitemap, 'posts', post_chunk, index=not (
+        listed and index_entry_current(
+            'posts', post_chunk, instance.updated_at.date())))
+    after_commit(invalidate_sitemap, 'profiles', profile_chunk, index=not (
+        listed and index_entry_current('profiles', profile_chunk)))
+    original_author_id = instance._original_author_id
+    if original_author_id not in (None, instance.author_id):
+        after_commit(
+            invalidate_sitemap, 'profiles', chunk_of(original_author_id))
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post_sitemaps(sender, instance, **kwargs):
+    after_commit(invalidate_sitemap, 'posts', chunk_of(instance.pk))
+    after_commit(
+        invalidate_sitemap, 'profiles', chunk_of(instance.author_id))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_sitemaps(sender, instance, **kwargs):
+    # От публикации категории зависит видимость всех её постов.
+    after_commit(invalidate_sitemap, 'categories', chunk_of(instance.pk))
+    after_commit(invalidate_sitemap, 'posts')
+    after_commit(invalidate_sitemap, 'profiles')
+
+
+@receiver(post_save, sender=User)
+def invalidate_profile_sitemap(sender, instance, update_fields=None,
+                               **kwargs):
+    # Правка пользователя меняет адрес, но не состав фрагментов.
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        after_commit(
+            invalidate_sitemap, 'profiles', chunk_of(instance.pk),
+            index=False)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_profile_sitemap(sender, instance, **kwargs):
+    after_commit(invalidate_sitemap, 'profiles', chunk_of(instance.pk))
@@ -0,0 +1,213 @@
+from urllib.parse import quote
+from uuid import uuid4
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import (
+    BigIntegerField, Exists, ExpressionWrapper, F, Max, OuterRef)
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import RFC3986_SUBDELIMS
+
+from .cache import page_cache_timeout
+from .constants import SITEMAP_CHUNK_SIZE
+from .feed import published_filter
+from .lookups import categories
+from .models import Category, Post, User
+
+SITEMAP_VERSION_KEY = 'sitemap_version:{}'
+SITEMAP_CHUNKS_KEY = 'sitemap_chunks:{}'
+SITEMAP_KEY = 'sitemap:{}:{}:{}'
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+CONTENT_TYPE = 'application/xml; charset=utf-8'
+# Так же экранирует аргументы reverse().
+URL_SAFE = RFC3986_SUBDELIMS + '/~:@'
+
+
+class Section:
+    url_name = None
+    url_field = 'pk'
+    lastmod_field = None
+
+    def queryset(self):
+        raise NotImplementedError
+
+    def url_format(self):
+        # reverse() на каждую строку обходится дороже самого запроса,
+        # поэтому адрес строится по шаблону, полученному один раз.
+        sample = 10 ** 12 if self.url_field == 'pk' else 'sitemap-sample'
+        return reverse(self.url_name, args=[sample]).replace(
+            str(sample), '{}')
+
+    def chunks(self):
+        chunks = self.queryset().annotate(chunk=ExpressionWrapper(
+            F('pk') / SITEMAP_CHUNK_SIZE, output_field=BigIntegerField()
+        )).order_by('chunk').values('chunk')
+        if self.lastmod_field:
+            return chunks.annotate(
+                lastmod=Max(self.lastmod_field)).values_list(
+                'chunk', 'lastmod')
+        return ((chunk, None) for chunk in chunks.values_list(
+            'chunk', flat=True).distinct())
+
+    def rows(self, chunk):
+        fields = [self.url_field]
+        if self.lastmod_field:
+            fields.append(self.lastmod_field)
+        return list(self.queryset().filter(
+            pk__gte=chunk * SITEMAP_CHUNK_SIZE,
+            pk__lt=(chunk + 1) * SITEMAP_CHUNK_SIZE,
+        ).order_by('pk').values_list(*fields))
+
+
+class PostSection(Section):
+    url_name = 'blog:post_detail'
+    lastmod_field = 'updated_at'
+
+    def queryset(self):
+        return Post.objects.filter(published_filter())
+
+
+class CategorySection(Section):
+    url_name = 'blog:category_posts'
+    url_field = 'slug'
+
+    def queryset(self):
+        return Category.objects.filter(is_published=True)
+
+
+class ProfileSection(Section):
+    url_name = 'blog:profile'
+    url_field = 'username'
+
+    def queryset(self):
+        return User.objects.filter(Exists(Post.objects.filter(
+            published_filter(), author=OuterRef('pk'))))
+
+
+SECTIONS = {
+    'posts': PostSection(),
+    'categories': CategorySection(),
+    'profiles': ProfileSection(),
+}
+
+
+def chunk_of(pk):
+    return pk // SITEMAP_CHUNK_SIZE
+
+
+def is_listed(post):
+    category = categories.get(post.category_id)
+    return bool(
+        post.is_published and post.pub_date <= timezone.now()
+        and category and category.is_published)
+
+
+def section_chunks(name):
+    # Сводка раздела для индекса: [(фрагмент, дата lastmod)]. Хранится
+    # отдельно, чтобы правка поста не пересчитывала GROUP BY по таблице.
+    key = SITEMAP_CHUNKS_KEY.format(name)
+    chunks = cache.get(key)
+    if chunks is None:
+        chunks = [
+            (chunk, lastmod and lastmod.date())
+            for chunk, lastmod in SECTIONS[name].chunks()]
+        cache.set(key, chunks, page_cache_timeout(
+            settings.SITEMAP_CACHE_TIMEOUT))
+    return chunks
+
+
+def index_entry_current(name, chunk, lastmod=None):
+    chunks = cache.get(SITEMAP_CHUNKS_KEY.format(name))
+    return chunks is not None and (chunk, lastmod) in chunks
+
+
+def sitemap_version(*parts):
+    return cache.get_or_set(
+        SITEMAP_VERSION_KEY.format(':'.join(map(str, parts))),
+        uuid4().hex, timeout=None)
+
+
+def invalidate_sitemap(section, chunk=None, index=True):
+    parts = (section,) if chunk is None else (section, chunk)
+    keys = [SITEMAP_VERSION_KEY.format(':'.join(map(str, parts)))]
+    if index:
+        keys.append(SITEMAP_CHUNKS_KEY.format(section))
+    cache.delete_many(keys)
+
+
+def sitemap_key(request, *parts):
+    version = ':'.join(
+        sitemap_version(*parts[:end]) for end in range(1, len(parts) + 1))
+    return SITEMAP_KEY.format(
+        request.get_host(), ':'.join(map(str, parts)), version)
+
+
+def lastmod_tag(lastmod=None):
+    if lastmod is None:
+        return ''
+    if hasattr(lastmod, 'date'):
+        lastmod = lastmod.date()
+    return f'<lastmod>{lastmod.isoformat()}</lastmod>'
+
+
+def render_index(request, entries):
+    yield f'{XML_HEADER}<sitemapindex xmlns="{XMLNS}">\n'
+    for name, chunk, lastmod in entries:
+        url = request.build_absolute_uri(
+            reverse('blog:sitemap_section', args=[name, chunk]))
+        yield (f'<sitemap><loc>{escape(url)}</loc>'
+               f'{lastmod_tag(lastmod)}</sitemap>\n')
+    yield '</sitemapindex>\n'
+
+
+def render_section(request, section, rows):
+    yield f'{XML_HEADER}<urlset xmlns="{XMLNS}">\n'
+    url_format = request.build_absolute_uri('/')[:-1] + section.url_format()
+    for value, *lastmod in rows:
+        url = url_format.format(quote(str(value), safe=URL_SAFE))
+        yield (f'<url><loc>{escape(url)}</loc>'
+               f'{lastmod_tag(*lastmod)}</url>\n')
+    yield '</urlset>\n'
+
+
+def streamed_and_cached(key, render):
+    content = cache.get(key)
+    if content is not None:
+        return HttpResponse(content, content_type=CONTENT_TYPE)
+    # render() и срок хранения читают базу сразу, а не при переборе
+    # потока: под ASGI тело ответа перебирается в цикле событий,
+    # где ORM недоступна.
+    parts = render()
+    timeout = page_cache_timeout(settings.SITEMAP_CACHE_TIMEOUT)
+
+    def stream():
+        # В кэш попадает только полностью отданный файл; его размер
+        # ограничен одним фрагментом, а не всей таблицей.
+        rendered = []
+        for part in parts:
+            rendered.append(part)
+            yield part
+        cache.set(key, ''.join(rendered), timeout)
+
+    return StreamingHttpResponse(stream(), content_type=CONTENT_TYPE)
+
+
+def sitemap_index(request):
+    entries = [
+        (name, chunk, lastmod)
+        for name in SECTIONS for chunk, lastmod in section_chunks(name)]
+    return HttpResponse(
+        ''.join(render_index(request, entries)), content_type=CONTENT_TYPE)
+
+
+def sitemap_section(request, section, chunk):
+    if section not in SECTIONS:
+        raise Http404
+    return streamed_and_cached(
+        sitemap_key(request, section, chunk),
+        lambda: render_section(
+            request, SECTIONS[section], SECTIONS[section].rows(chunk)))
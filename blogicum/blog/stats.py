@@ -0,0 +1,71 @@
+from django.db.models import (
+    Case, Count, Exists, F, IntegerField, OuterRef, Subquery, Value, When)
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import AuthorStats, Category, Post
+
+
+def shifted(field, delta):
+    return Greatest(F(field) + delta, 0)
+
+
+def listed(is_published, category_id):
+    # 1, если пост попадает в публичные списки: опубликован и лежит
+    # в опубликованной категории. Категория проверяется в самом UPDATE,
+    # потому что таблица категорий в кэше обновляется только после
+    # фиксации транзакции.
+    if not is_published or category_id is None:
+        return Value(0)
+    return Case(
+        When(Exists(Category.objects.filter(
+            pk=category_id, is_published=True)), then=Value(1)),
+        default=Value(0), output_field=IntegerField())
+
+
+def latest_publication(author_id):
+    return Subquery(Post.objects.filter(
+        author_id=author_id, is_published=True
+    ).order_by('-pub_date').values('pub_date')[:1])
+
+
+def adjust_author_stats(author_id, posts=0, listed=0, comments=0):
+    # Один UPDATE: счётчики сдвигаются на месте, а дата последней
+    # публикации берётся по индексу (author_id, pub_date).
+    AuthorStats.objects.filter(user_id=author_id).update(
+        post_count=shifted('post_count', posts),
+        listed_post_count=shifted('listed_post_count', listed),
+        comment_count=shifted('comment_count', comments),
+        latest_pub_date=latest_publication(author_id),
+    )
+
+
+def adjust_received_comments(post_id, delta):
+    AuthorStats.objects.filter(user_id=Subquery(
+        Post.objects.filter(pk=post_id).values('author_id')[:1])
+    ).update(comment_count=shifted('comment_count', delta))
+
+
+def recount_listed_posts(author_ids):
+    AuthorStats.objects.filter(user_id__in=author_ids).update(
+        listed_post_count=Coalesce(Subquery(
+            Post.objects.filter(
+                author=OuterRef('user'), is_published=True,
+                category__is_published=True,
+            ).order_by().values('author').annotate(
+                total=Count('pk')).values('total')), Value(0)))
+
+
+def visible_post_count(author, viewer=None, now=None):
+    stats = getattr(author, 'stats', None)
+    if stats is None:
+        return None
+    if viewer is not None and viewer.pk == author.pk:
+        return stats.post_count
+    now = now or timezone.now()
+    if stats.latest_pub_date is None or stats.latest_pub_date <= now:
+        return stats.listed_post_count
+    # Отложенные публикации ещё не видны: вычитаем их по индексу.
+    return stats.listed_post_count - Post.objects.filter(
+        author=author, is_published=True, category__is_published=True,
+        pub_date__gt=now).count()
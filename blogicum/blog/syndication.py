@@ -0,0 +1,98 @@
+from django.contrib.syndication.views import Feed
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+
+from .constants import FEED_SIZE
+from .feed import author_feed, category_feed, post_feed
+from .lookups import attach_lookups, published_category
+from .models import User
+
+
+class LatestPostsFeed(Feed):
+    title = 'Блогикум'
+    description = 'Новые публикации в Блогикуме'
+
+    def link(self):
+        return reverse('blog:index')
+
+    def get_posts(self, obj):
+        return post_feed()
+
+    def items(self, obj):
+        return attach_lookups(list(self.get_posts(obj)[:FEED_SIZE]))
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return post.text
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_updateddate(self, post):
+        return post.updated_at
+
+    def item_author_name(self, post):
+        return post.author.get_full_name() or post.author.username
+
+    def item_categories(self, post):
+        return [post.category.title] if post.category else []
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class CategoryPostsFeed(LatestPostsFeed):
+    def get_object(self, request, category_slug):
+        category = published_category(category_slug)
+        if category is None:
+            raise Http404
+        return category
+
+    def title(self, category):
+        return f'Блогикум: {category.title}'
+
+    def description(self, category):
+        return category.description
+
+    def link(self, category):
+        return reverse('blog:category_posts', args=[category.slug])
+
+    def get_posts(self, category):
+        return category_feed(category)
+
+
+class CategoryPostsAtomFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, category):
+        return category.description
+
+
+class AuthorPostsFeed(LatestPostsFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, author):
+        return f'Блогикум: публикации {author.username}'
+
+    def description(self, author):
+        return f'Новые публикации пользователя {author.username}'
+
+    def link(self, author):
+        return reverse('blog:profile', args=[author.username])
+
+    def get_posts(self, author):
+        return author_feed(author)
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, author):
+        return self.description(author)
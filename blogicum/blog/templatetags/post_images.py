@@ -0,0 +1,13 @@
+from django import template
+from django.utils.html import format_html
+
+from blog.images import rendition_urls
+
+register = template.Library()
+
+
+@register.simple_tag
+def image_srcset(image, rendition='card'):
+    url, retina_url = rendition_urls(image, rendition)
+    return format_html(
+        'src="{}" srcset="{} 1x, {} 2x"', url, url, retina_url)
@@ -0,0 +1,10 @@
+from django import template
+
+from blog.search import highlight
+
+register = template.Library()
+
+
+@register.filter
+def highlight_snippet(snippet):
+    return highlight(snippet)
@@ -3,28 +3,90 @@ from django.conf.urls.static import static
 from django.urls import path
 
 
-from . import views
+from . import api, sitemaps, syndication, views
+from .async_views import read_page
+from .cache import cache_anonymous_page
+from .conditional import (
+    category_last_modified, conditional_anonymous_page, index_last_modified,
+    profile_last_modified)
 from .views import e_handler500
 
 app_name = 'blog'
 
 urlpatterns = [
-    path('', views.PostListView.as_view(),
+    path('',
+         read_page(cache_anonymous_page('index')(
+             conditional_anonymous_page(index_last_modified)(
+                 views.PostListView.as_view()))),
          name='index'),
     path('category/<str:category_slug>/',
-         views.CategoryListView.as_view(),
+         read_page(cache_anonymous_page('category:{category_slug}')(
+             conditional_anonymous_page(category_last_modified)(
+                 views.CategoryListView.as_view()))),
          name='category_posts'),
+    path('feeds/rss/',
+         cache_anonymous_page('index')(
+             conditional_anonymous_page(index_last_modified)(
+                 syndication.LatestPostsFeed())),
+         name='feed_rss'),
+    path('feeds/atom/',
+         cache_anonymous_page('index')(
+             conditional_anonymous_page(index_last_modified)(
+                 syndication.LatestPostsAtomFeed())),
+         name='feed_atom'),
+    path('category/<str:category_slug>/rss/',
+         cache_anonymous_page('category:{category_slug}')(
+             conditional_anonymous_page(category_last_modified)(
+                 syndication.CategoryPostsFeed())),
+         name='category_feed_rss'),
+    path('category/<str:category_slug>/atom/',
+         cache_anonymous_page('category:{category_slug}')(
+             conditional_anonymous_page(category_last_modified)(
+                 syndication.CategoryPostsAtomFeed())),
+         name='category_feed_atom'),
+    path('sitemap.xml', sitemaps.sitemap_index, name='sitemap'),
+    path('sitemap-<str:section>-<int:chunk>.xml',
+         sitemaps.sitemap_section,
+         name='sitemap_section'),
+    path('search/', views.PostSearchView.as_view(), name='search'),
+    path('api/posts/', api.posts, name='api_posts'),
+    path('api/posts/<int:pk>/', api.post_detail, name='api_post_detail'),
+    path('api/posts/<int:pk>/comments/',
+         api.post_comments,
+         name='api_post_comments'),
+    path('api/category/<str:category_slug>/posts/',
+         api.category_posts,
+         name='api_category_posts'),
+    path('api/profile/<username>/posts/',
+         api.profile_posts,
+         name='api_profile_posts'),
     path('profile/<username>/',
-         views.ShowsProfilePageView.as_view(),
+         read_page(cache_anonymous_page('author:{username}')(
+             conditional_anonymous_page(profile_last_modified)(
+                 views.ShowsProfilePageView.as_view()))),
          name='profile'),
+    path('profile/<username>/rss/',
+         cache_anonymous_page('author:{username}')(
+             conditional_anonymous_page(profile_last_modified)(
+                 syndication.AuthorPostsFeed())),
+         name='profile_feed_rss'),
+    path('profile/<username>/atom/',
+         cache_anonymous_page('author:{username}')(
+             conditional_anonymous_page(profile_last_modified)(
+                 syndication.AuthorPostsAtomFeed())),
+         name='profile_feed_atom'),
     path('edit_profile/', views.UserEditView.as_view(), name='edit_profile'),
 
     path('posts/create/',
          views.PostCreateView.as_view(),
          name='create_post'),
     path('posts/<int:pk>/',
-         views.PostDetailView.as_view(),
+         read_page(cache_anonymous_page('post:{pk}')(
+             views.PostDetailView.as_view())),
          name='post_detail'),
+    path('posts/<int:pk>/comments/',
+         views.PostCommentsView.as_view(),
+         name='post_comments'),
     path('posts/<int:pk>/edit/',
          views.PostUpdateView.as_view(),
          name='edit_post'),
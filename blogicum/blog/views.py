@@ -1,65 +1,91 @@
+from functools import partial
+
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.paginator import Paginator
-from django.db.models import Count
+from django.http import Http404
 from django.shortcuts import (
     get_object_or_404, HttpResponseRedirect, redirect, render, reverse)
 from django.template import RequestContext
 from django.urls import reverse_lazy
-from django.utils import timezone
 from django.views import generic
 from django.views.generic import (
     CreateView, DeleteView, DetailView, ListView, UpdateView)
 
+from .conditional import post_last_modified, respond_conditionally
+from .constants import POSTS_PER_PAGE
+from .feed import author_feed, category_feed, is_visible, post_feed
 from .forms import CommentForm, PostForm
-from .models import Category, Comment, Post, User
+from .lookups import attach_lookups, published_category
+from .models import Comment, Post, User
+from .pagination import comment_batch, paginate_posts
+from .search import search_posts
+from .stats import visible_post_count
 
 
 class PostListView(ListView):
     model = Post
     template_name = 'blog/index.html'
-    paginate_by = 10
+    paginate_by = POSTS_PER_PAGE
+
+    def feed(self, now=None):
+        return post_feed(now)
 
     def get_queryset(self):
-        page_obj = Post.objects.filter(
-            pub_date__lte=timezone.now(),
-            is_published=True,
-            category__is_published=True
-        ).order_by("-pub_date")
-        if self.request.user.is_authenticated:
-            page_obj = page_obj | Post.objects.all().filter(
-                author_id=self.request.user.pk,
-                is_published=True,
-                category__is_published=True,
-                pub_date__lte=timezone.now(),
-            ).order_by("-pub_date")
-        return page_obj.annotate(comment_count=Count('comments'))
+        return self.feed()
+
+    def paginate_queryset(self, queryset, page_size):
+        page_obj = paginate_posts(self.request, self.feed, page_size)
+        return (page_obj.paginator, page_obj, page_obj.object_list,
+                page_obj.has_other_pages())
+
+
+class PostSearchView(ListView):
+    template_name = 'blog/search.html'
+    paginate_by = POSTS_PER_PAGE
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        return search_posts(post_feed(), self.query)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        return context
 
 
 class PostDetailView(DetailView):
     model = Post
     template_name = 'blog/detail.html'
+    queryset = Post.objects.select_related('author')
 
-    def dispatch(self, request, *args, **kwargs):
-        p = Post.objects.filter(pk=kwargs['pk'])
-        if self.request.user.id != p[0].author_id and p[0].is_published == 0:
-            return redirect('blog:index')
-        if (self.request.user.id != p[0].author_id
-                and p[0].pub_date > timezone.now()):
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        attach_lookups([self.object])
+        if not is_visible(self.object, request.user):
             return redirect('blog:index')
-        else:
-            return super(PostDetailView, self
-                         ).dispatch(request, *args, **kwargs)
+        return respond_conditionally(
+            request, post_last_modified(self.object), self.render_post)
+
+    def render_post(self, request):
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        comments = self.object.comments.filter(post=self.object.id)
+        comments, next_cursor = comment_batch(
+            self.object.comments.select_related('author'),
+            self.request.GET.get('after', ''))
         context.update({
             'form': CommentForm(),
             'comments': comments,
+            'next_comments_cursor': next_cursor,
         })
         return context
 
 
+class PostCommentsView(PostDetailView):
+    template_name = 'includes/comment_list.html'
+
+
 class CommentAddView(LoginRequiredMixin, CreateView):
     model = Comment
     fields = ['text']
@@ -120,30 +146,28 @@ class PostDeleteView(LoginRequiredMixin, DeleteView):
 
 
 class CategoryListView(ListView):
-    model = Post
     template_name = 'blog/category.html'
+    paginate_by = POSTS_PER_PAGE
+
+    def get_queryset(self):
+        # Категория берётся из кэшированной таблицы slug -> категория,
+        # поэтому для неопубликованной выдача даже не строится.
+        self.category = published_category(self.kwargs['category_slug'])
+        if self.category is None:
+            raise Http404
+        return self.feed()
+
+    def feed(self, now=None):
+        return category_feed(self.category, now)
+
+    def paginate_queryset(self, queryset, page_size):
+        page_obj = paginate_posts(self.request, self.feed, page_size)
+        return (page_obj.paginator, page_obj, page_obj.object_list,
+                page_obj.has_other_pages())
 
     def get_context_data(self, **kwargs):
-        query = Post.objects.filter(
-            is_published=True,
-            pub_date__lte=timezone.now(),
-            category__slug=self.kwargs['category_slug'],
-        ).order_by('-pub_date')
-        if self.request.user.is_authenticated:
-            query = query | query.filter(
-                author_id=self.request.user.pk,
-                is_published=True,
-                pub_date__lte=timezone.now()
-            ).order_by('-pub_date').annotate(comment_count=Count('comments'))
-        paginator = Paginator(query, 10)
-        page_number = self.request.GET.get('page')
-        query = paginator.get_page(page_number)
         context = super().get_context_data(**kwargs)
-        context.update({
-            'page_obj': query,
-            'category': get_object_or_404(Category,
-                                          slug=self.kwargs['category_slug'],
-                                          is_published=True)})
+        context['category'] = self.category
         return context
 
 
@@ -194,23 +218,17 @@ class ShowsProfilePageView(DetailView):
     slug_url_kwarg = 'username'
     slug_field = 'username'
     template_name = 'blog/profile.html'
-    queryset = User.objects
+    queryset = User.objects.select_related('stats')
     context_object_name = 'profile'
 
     def get_context_data(self, **kwargs):
-        page_obj = self.object.posts.select_related(
-            'author').filter(pub_date__lte=timezone.now(), is_published=True
-                             ).order_by('-pub_date')
-        if self.request.user.is_authenticated:
-            page_obj = page_obj | self.object.posts.filter(
-                author_id=self.request.user.pk).order_by('-pub_date')
-        page_obj = page_obj.annotate(comment_count=Count('comments'))
-        paginator = Paginator(page_obj, 10)
-        request = self.request
-        page_number = request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
+        post_count = visible_post_count(self.object, self.request.user)
+        page_obj = paginate_posts(
+            self.request,
+            partial(author_feed, self.object, self.request.user),
+            count=post_count)
         context = super().get_context_data(**kwargs)
-        context.update({'page_obj': page_obj})
+        context.update({'page_obj': page_obj, 'post_count': post_count})
         return context
 
 
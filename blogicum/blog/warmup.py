@@ -0,0 +1,36 @@
+import time
+from pathlib import Path
+
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.template.loaders.cached import Loader as CachedLoader
+
+
+def template_names(directories):
+    for directory in map(Path, directories):
+        for path in sorted(directory.rglob('*')):
+            if path.is_file():
+                yield path.relative_to(directory).as_posix()
+
+
+def django_engines():
+    return [backend.engine for backend in engines.all()
+            if isinstance(backend, DjangoTemplates)]
+
+
+def cached_loaders(engine):
+    return [loader for loader in engine.template_loaders
+            if isinstance(loader, CachedLoader)]
+
+
+def warm_templates(reset=False):
+    timings = []
+    for engine in django_engines():
+        if reset:
+            for loader in cached_loaders(engine):
+                loader.reset()
+        for name in template_names(engine.dirs):
+            start = time.perf_counter()
+            engine.get_template(name)
+            timings.append((name, time.perf_counter() - start))
+    return timings
@@ -0,0 +1,22 @@
+import os
+
+
+def database_from_env(base_dir):
+    engine = os.getenv('DB_ENGINE', 'sqlite')
+    if engine == 'postgresql':
+        return {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'blogicum'),
+            'USER': os.getenv('DB_USER', 'blogicum'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        }
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('DB_NAME', base_dir / 'db.sqlite3'),
+        'OPTIONS': {
+            'timeout': int(os.getenv('DB_BUSY_TIMEOUT', 20)),
+        },
+    }
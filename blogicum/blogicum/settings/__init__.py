@@ -0,0 +1,6 @@
+import os
+
+if os.getenv('DJANGO_ENV') == 'prod':
+    from .prod import *  # noqa: F401,F403
+else:
+    from .dev import *  # noqa: F401,F403
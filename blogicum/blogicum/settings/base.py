@@ -0,0 +1,169 @@
+import os
+from pathlib import Path
+
+from ..database import database_from_env
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+SECRET_KEY = 'django-insecure-i)wkqt+pu2u+*u^%=9v8+zr30_4)-6@h0vad4jn9mzw1_85^%7'
+
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1',
+]
+
+INSTALLED_APPS = [
+    'blog.apps.BlogConfig',
+    'pages.apps.PagesConfig',
+    'core.apps.CoreConfig',
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'django_bootstrap5',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'blogicum.urls'
+
+TEMPLATES_DIR = BASE_DIR / 'templates'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+# Компилировать все шаблоны из TEMPLATES_DIR при запуске, чтобы первый
+# запрос после деплоя не платил за разбор шаблонов.
+TEMPLATE_WARMUP = False
+
+WSGI_APPLICATION = 'blogicum.wsgi.application'
+
+# Движок выбирается переменной окружения DB_ENGINE: sqlite (по умолчанию)
+# или postgresql; параметры подключения — DB_NAME, DB_USER, DB_PASSWORD,
+# DB_HOST, DB_PORT, DB_CONN_MAX_AGE, DB_BUSY_TIMEOUT.
+DATABASES = {
+    'default': database_from_env(BASE_DIR),
+}
+
+# Выполняются при каждом новом подключении к SQLite.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+    'cache_size': -20000,
+}
+
+# Проверять постоянное подключение перед каждым запросом.
+DATABASE_HEALTH_CHECKS = True
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+LANGUAGE_CODE = 'ru-RU'
+
+TIME_ZONE = 'Europe/Moscow'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+STATIC_URL = '/static/'
+
+STATICFILES_DIRS = [
+    BASE_DIR / 'static',
+]
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+LOGIN_REDIRECT_URL = 'blog:index'
+
+LOGIN_URL = 'login'
+
+LOGOUT_REDIRECT_URL = 'blog:index'
+
+MEDIA_URL = '/media/'
+
+MEDIA_ROOT = BASE_DIR / 'media'
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
+
+# 'offset' — нумерованные страницы, 'keyset' — навигация «новее/старее»
+# по курсору (pub_date, id) без OFFSET и COUNT(*).
+POSTS_PAGINATION = 'offset'
+
+# Для режима 'keyset': показывать число публикаций, считая не больше
+# указанного количества строк. None — не считать.
+POSTS_APPROXIMATE_COUNT_LIMIT = None
+
+# Время жизни отрисованных карточек публикаций в кэше, секунды.
+POST_CARD_CACHE_TIMEOUT = 60 * 60
+
+# Для нескольких процессов можно использовать файловый кэш:
+# 'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+# 'LOCATION': BASE_DIR / 'cache',
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Время жизни страниц, закэшированных для анонимных посетителей, секунды.
+PAGE_CACHE_TIMEOUT = 60 * 5
+
+# Время жизни отрисованных фрагментов sitemap.xml, секунды. Фрагмент
+# пересоздаётся раньше, если изменились его записи.
+SITEMAP_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Подключать асинхронные варианты страниц чтения. Имеет смысл только
+# при запуске через ASGI (blogicum.asgi); под WSGI они медленнее.
+ASYNC_VIEWS = os.getenv('DJANGO_ASYNC_VIEWS', '') == '1'
@@ -0,0 +1,13 @@
+from django.contrib.staticfiles import storage
+
+
+class ManifestStaticFilesStorage(storage.ManifestStaticFilesStorage):
+    manifest_strict = False
+
+    def stored_name(self, name):
+        # Файл, не попавший в collectstatic, отдаётся по исходному имени
+        # вместо ошибки 500 на каждой странице.
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
@@ -17,7 +17,7 @@ urlpatterns = [
     path('auth/', include('blog.urls'))
 ]
 
-if settings.DEBUG:
+if 'debug_toolbar' in settings.INSTALLED_APPS:
     import debug_toolbar
 
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
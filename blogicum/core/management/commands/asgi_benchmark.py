@@ -0,0 +1,144 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.feed import post_feed
+
+MODES = {
+    'wsgi': {'DJANGO_ASYNC_VIEWS': '0'},
+    'asgi-sync': {'DJANGO_ASYNC_VIEWS': '0'},
+    'asgi-async': {'DJANGO_ASYNC_VIEWS': '1'},
+}
+
+# Обработчики вызываются напрямую, без сетевого сервера: WSGI — из пула
+# потоков, как в многопоточном сервере, ASGI — из задач asyncio.
+SCRIPT = '''
+import asyncio, io, json, sys, time
+from concurrent.futures import ThreadPoolExecutor
+import django
+django.setup()
+mode, paths, total, concurrency = (
+    sys.argv[1], json.loads(sys.argv[2]), int(sys.argv[3]), int(sys.argv[4]))
+latencies, statuses = [], {}
+
+
+def record(start, status):
+    latencies.append(time.perf_counter() - start)
+    statuses[status] = statuses.get(status, 0) + 1
+
+
+def run_wsgi():
+    from django.core.handlers.wsgi import WSGIHandler
+    app = WSGIHandler()
+
+    def call(path):
+        start = time.perf_counter()
+        status = []
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '',
+            'SERVER_NAME': 'localhost', 'SERVER_PORT': '80',
+            'HTTP_HOST': 'localhost', 'REMOTE_ADDR': '10.0.0.1',
+            'wsgi.input': io.BytesIO(), 'wsgi.url_scheme': 'http',
+        }
+        result = app(environ, lambda code, headers: status.append(code))
+        b''.join(result)
+        result.close()
+        record(start, int(status[0].split()[0]))
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(call, (paths[i % len(paths)] for i in range(total))))
+
+
+async def run_asgi():
+    from django.core.handlers.asgi import ASGIHandler
+    app = ASGIHandler()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def call(path):
+        async with semaphore:
+            start = time.perf_counter()
+            status = []
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+
+            await app({
+                'type': 'http', 'asgi': {'version': '3.0'},
+                'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+                'path': path, 'raw_path': path.encode(), 'query_string': b'',
+                'root_path': '', 'headers': [(b'host', b'localhost')],
+                'client': ('10.0.0.1', 1234), 'server': ('localhost', 80),
+            }, receive, send)
+            record(start, status[0])
+
+    await asyncio.gather(*(
+        call(paths[i % len(paths)]) for i in range(total)))
+
+
+start = time.perf_counter()
+if mode == 'wsgi':
+    run_wsgi()
+else:
+    asyncio.run(run_asgi())
+elapsed = time.perf_counter() - start
+latencies.sort()
+print(json.dumps({
+    'rps': total / elapsed,
+    'p50': latencies[len(latencies) // 2],
+    'p95': latencies[int(len(latencies) * 0.95)],
+    'statuses': statuses,
+}))
+'''
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный замер страниц чтения в трёх режимах: WSGI, ASGI '
+            'с синхронными представлениями и ASGI с асинхронными. Запускайте '
+            'с профилем настроек prod: debug toolbar синхронный и делает '
+            'сравнение бессмысленным.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=100)
+        parser.add_argument(
+            '--modes', nargs='+', choices=MODES, default=list(MODES))
+
+    def handle(self, *args, **options):
+        post = post_feed().select_related('category').first()
+        if post is None:
+            raise CommandError('Нет опубликованных постов для замера.')
+        paths = [
+            '/',
+            f'/category/{post.category.slug}/',
+            f'/profile/{post.author.username}/',
+            post.get_absolute_url(),
+            '/pages/about/',
+        ]
+        for mode in options['modes']:
+            result = self.run(
+                mode, paths, options['requests'], options['concurrency'])
+            self.stdout.write(
+                f'{mode}: {result["rps"]:.0f} запр/с, '
+                f'p50={result["p50"] * 1000:.1f} мс, '
+                f'p95={result["p95"] * 1000:.1f} мс, '
+                f'статусы {result["statuses"]}')
+
+    def run(self, mode, paths, requests, concurrency):
+        env = {**os.environ, **MODES[mode]}
+        completed = subprocess.run(
+            [sys.executable, '-c', SCRIPT, mode, json.dumps(paths),
+             str(requests), str(concurrency)],
+            cwd=Path(__file__).resolve().parents[3],
+            env=env, capture_output=True, text=True,
+        )
+        if completed.returncode:
+            raise CommandError(completed.stderr)
+        return json.loads(completed.stdout.splitlines()[-1])
@@ -0,0 +1,74 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+PROFILES = ('dev', 'prod')
+
+# Выполняется в отдельном процессе, чтобы время запуска измерялось
+# с нуля и профили не влияли друг на друга.
+SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+startup = time.perf_counter() - start
+from django.test import Client
+client = Client(SERVER_NAME='localhost')
+paths, requests = json.loads(sys.argv[1]), int(sys.argv[2])
+result = {'startup': startup, 'paths': {}}
+for path in paths:
+    client.get(path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        status = client.get(path).status_code
+    elapsed = time.perf_counter() - start
+    result['paths'][path] = {'status': status, 'rps': requests / elapsed}
+print(json.dumps(result))
+'''
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает профили настроек dev и prod: время запуска '
+            'Django и число запросов в секунду на указанных страницах.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths', nargs='*', default=['/', '/pages/about/'])
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument(
+            '--runs', type=int, default=5,
+            help='Сколько раз запускать процесс для замера старта.')
+
+    def handle(self, *args, **options):
+        for profile in PROFILES:
+            results = [
+                self.run(profile, options['paths'], options['requests'])
+                for _ in range(options['runs'])
+            ]
+            startup = sorted(result['startup'] for result in results)
+            self.stdout.write(
+                f'{profile}: запуск {startup[len(startup) // 2] * 1000:.0f} '
+                f'мс (медиана из {len(startup)})')
+            for path in options['paths']:
+                stats = [result['paths'][path] for result in results]
+                rps = sorted(stat['rps'] for stat in stats)
+                self.stdout.write(
+                    f'  {path}: {rps[len(rps) // 2]:.0f} запр/с '
+                    f'(статус {stats[0]["status"]})')
+
+    def run(self, profile, paths, requests):
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': f'blogicum.settings.{profile}',
+        }
+        env.setdefault('DJANGO_SECRET_KEY', 'settings-benchmark')
+        output = subprocess.run(
+            [sys.executable, '-c', SCRIPT, json.dumps(paths), str(requests)],
+            cwd=Path(__file__).resolve().parents[3],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        return json.loads(output.splitlines()[-1])
@@ -1,12 +1,19 @@
 from django.urls import path
 
+from blog.async_views import read_page
+from blog.cache import cache_anonymous_page
+
 from . import views
 
 app_name = 'pages'
 
 urlpatterns = [
-    path('about/', views.About.as_view(), name='about'),
-    path('rules/', views.Rules.as_view(), name='rules'),
+    path('about/',
+         read_page(cache_anonymous_page('pages')(views.About.as_view())),
+         name='about'),
+    path('rules/',
+         read_page(cache_anonymous_page('pages')(views.Rules.as_view())),
+         name='rules'),
 ]
 
 handler404 = views.page_not_found
@@ -10,10 +10,12 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test.client import Client
+from django.utils import timezone
 from mixer.backend.django import mixer as _mixer
 
 N_PER_FIXTURE = 3
@@ -106,6 +108,24 @@ def unlogged_client(client):
     return client
 
 
+@pytest.fixture
+def no_debug_toolbar(settings):
+    # Панель отладки подменяет курсор и скрывает запросы от подсчёта.
+    settings.INTERNAL_IPS = []
+
+
+@pytest.fixture(autouse=True)
+def immediate_on_commit(request, monkeypatch):
+    # Тест идёт в транзакции, которая откатывается и не фиксируется, так
+    # что колбэки on_commit выполняются сразу, как при автокоммите. Тесты
+    # с transaction=True проверяют настоящую фиксацию.
+    marker = request.node.get_closest_marker('django_db')
+    if marker and marker.kwargs.get('transaction'):
+        return
+    monkeypatch.setattr(
+        transaction, 'on_commit', lambda func, using=None: func())
+
+
 @pytest.fixture
 def another_user_client(another_user):
     client = Client()
@@ -113,6 +133,22 @@ def another_user_client(another_user):
     return client
 
 
+@pytest.fixture
+def visibility_posts(mixer, user):
+    # Опубликованный, снятый с публикации и отложенный посты в одной
+    # опубликованной категории.
+    day = timezone.timedelta(days=1)
+    category = mixer.blend('blog.Category', is_published=True)
+    return mixer.cycle(3).blend(
+        'blog.Post', author=user, category=category,
+        text='Рассказ про черепаху',
+        title=(title for title in ('Опубликована', 'Скрыта', 'Отложена')),
+        is_published=(flag for flag in (True, False, True)),
+        pub_date=(date for date in (
+            timezone.now() - day, timezone.now() - day,
+            timezone.now() + day)))
+
+
 def get_post_list_context_key(
         user_client, page_url, page_load_err_msg, key_missing_msg):
     try:
@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('no_debug_toolbar'),
+]
+
+
+@pytest.fixture
+def api_posts(mixer, user):
+    category = mixer.blend('blog.Category', is_published=True)
+    day = timezone.timedelta(days=1)
+    posts = mixer.cycle(12).blend(
+        'blog.Post', author=user, category=category, is_published=True,
+        pub_date=(timezone.now() - day * i for i in range(1, 13)))
+    hidden = mixer.blend(
+        'blog.Post', author=user, category=category, is_published=False,
+        pub_date=timezone.now() - day)
+    return posts, hidden
+
+
+def test_api_post_list(client, api_posts):
+    posts, hidden = api_posts
+    response = client.get('/api/posts/?fields=id,title&limit=5')
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что `/api/posts/` доступен анонимному пользователю.')
+    data = response.json()
+    assert data['results'] == [
+        {'id': post.id, 'title': post.title} for post in posts[:5]], (
+        'Убедитесь, что API отдаёт только запрошенные поля опубликованных '
+        'постов, от новых к старым.')
+    next_ids = [
+        item['id'] for item in client.get(data['next']).json()['results']]
+    assert next_ids == [post.id for post in posts[5:10]], (
+        'Убедитесь, что ссылка `next` ведёт на следующую страницу постов.')
+
+
+def test_api_unknown_field(client, api_posts):
+    response = client.get('/api/posts/?fields=id,password')
+    assert response.status_code == HTTPStatus.BAD_REQUEST, (
+        'Убедитесь, что запрос неизвестных полей возвращает статус 400.')
+
+
+def test_api_post_detail_visibility(client, user_client, api_posts):
+    hidden = api_posts[1]
+    url = f'/api/posts/{hidden.id}/'
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+        'Убедитесь, что снятый с публикации пост недоступен через API '
+        'другим пользователям.')
+    assert user_client.get(url).status_code == HTTPStatus.OK, (
+        'Убедитесь, что автор видит свой неопубликованный пост через API.')
+
+
+def test_api_post_detail_not_modified(client, api_posts):
+    url = f'/api/posts/{api_posts[0][0].id}/'
+    response = client.get(url)
+    assert client.get(
+        url, HTTP_IF_NONE_MATCH=response['ETag']
+    ).status_code == HTTPStatus.NOT_MODIFIED, (
+        'Убедитесь, что API отвечает 304 для неизменённого поста.')
+
+
+def test_api_comments(client, api_posts, mixer):
+    post = api_posts[0][0]
+    comments = mixer.cycle(3).blend('blog.Comment', post=post)
+    data = client.get(f'/api/posts/{post.id}/comments/?limit=2').json()
+    assert [item['id'] for item in data['results']] == [
+        comment.id for comment in comments[:2]], (
+        'Убедитесь, что API отдаёт комментарии от старых к новым.')
+    rest = client.get(data['next']).json()
+    assert [item['id'] for item in rest['results']] == [comments[2].id], (
+        'Убедитесь, что ссылка `next` ведёт к следующим комментариям.')
+
+
+def test_api_comments_queries(
+        client, api_posts, mixer, django_assert_num_queries):
+    post = api_posts[0][0]
+    mixer.cycle(5).blend('blog.Comment', post=post)
+    with django_assert_num_queries(2):
+        data = client.get(f'/api/posts/{post.id}/comments/').json()
+    assert len(data['results']) == 5, (
+        'Убедитесь, что комментарии читаются одним запросом, без '
+        'отдельного запроса на каждый комментарий.')
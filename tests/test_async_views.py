@@ -0,0 +1,30 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from blog.async_views import async_page
+from blog.cache import cache_anonymous_page
+
+
+@pytest.mark.django_db
+def test_async_page_serves_cache_hits_without_view():
+    calls = []
+
+    def view(request):
+        calls.append(request)
+        return HttpResponse('страница')
+
+    page = async_page(cache_anonymous_page('test')(view))
+    factory = RequestFactory()
+    for _ in range(3):
+        request = factory.get('/async-test/')
+        request.user = AnonymousUser()
+        response = async_to_sync(page)(request)
+        assert response.status_code == HTTPStatus.OK
+    assert len(calls) == 1, (
+        'Убедитесь, что асинхронный вариант страницы отдаёт закэшированный '
+        'ответ, не вызывая синхронное представление.')
@@ -0,0 +1,120 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import AuthorStats
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('no_debug_toolbar'),
+]
+
+
+def stats_of(user):
+    return AuthorStats.objects.values(
+        'post_count', 'listed_post_count', 'comment_count',
+        'latest_pub_date').get(user=user)
+
+
+def test_author_stats_follow_writes(mixer, user):
+    day = timezone.timedelta(days=1)
+    post = mixer.blend(
+        'blog.Post', author=user, is_published=True,
+        pub_date=timezone.now() - day)
+    hidden = mixer.blend(
+        'blog.Post', author=user, is_published=False,
+        pub_date=timezone.now())
+    comments = mixer.cycle(3).blend('blog.Comment', post=post)
+    assert stats_of(user) == {
+        'post_count': 2, 'listed_post_count': 1, 'comment_count': 3,
+        'latest_pub_date': post.pub_date,
+    }, (
+        'Убедитесь, что статистика автора обновляется при создании '
+        'публикаций и комментариев.')
+    comments[0].delete()
+    hidden.is_published = True
+    hidden.save()
+    assert stats_of(user) == {
+        'post_count': 2, 'listed_post_count': 2, 'comment_count': 2,
+        'latest_pub_date': hidden.pub_date,
+    }, (
+        'Убедитесь, что статистика автора учитывает публикацию поста '
+        'и удаление комментария.')
+    post.delete()
+    assert stats_of(user) == {
+        'post_count': 1, 'listed_post_count': 1, 'comment_count': 0,
+        'latest_pub_date': hidden.pub_date,
+    }, (
+        'Убедитесь, что при удалении поста из статистики автора вычитаются '
+        'и пост, и его комментарии.')
+
+
+def test_recount_author_stats(mixer, user):
+    post = mixer.blend('blog.Post', author=user, is_published=True)
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    expected = stats_of(user)
+    AuthorStats.objects.filter(user=user).delete()
+    call_command('recount_author_stats', stdout=StringIO())
+    assert stats_of(user) == expected, (
+        'Убедитесь, что команда `recount_author_stats` восстанавливает '
+        'статистику авторов.')
+
+
+def test_profile_uses_author_stats(client, mixer, user):
+    day = timezone.timedelta(days=1)
+    mixer.cycle(3).blend(
+        'blog.Post', author=user, is_published=True,
+        pub_date=timezone.now() - day, category__is_published=True)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f'/profile/{user.username}/')
+    assert response.status_code == HTTPStatus.OK
+    assert response.context['post_count'] == 3, (
+        'Убедитесь, что страница профиля показывает число публикаций '
+        'автора.')
+    assert not any('COUNT(' in query['sql'] for query in queries), (
+        'Убедитесь, что страница профиля берёт число публикаций из '
+        'статистики автора, а не считает их запросом.')
+
+
+def test_author_stats_follow_category_visibility(client, mixer, user):
+    category = mixer.blend('blog.Category', is_published=False)
+    mixer.blend(
+        'blog.Post', author=user, category=category, is_published=True,
+        pub_date=timezone.now() - timezone.timedelta(days=1))
+    assert stats_of(user)['listed_post_count'] == 0, (
+        'Убедитесь, что посты из снятых с публикации категорий не входят '
+        'в число видимых публикаций автора.')
+    assert client.get(
+        f'/profile/{user.username}/').context['post_count'] == 0
+    category.is_published = True
+    category.save()
+    assert stats_of(user)['listed_post_count'] == 1, (
+        'Убедитесь, что публикация категории пересчитывает видимые '
+        'публикации её авторов.')
+    category.delete()
+    assert stats_of(user)['listed_post_count'] == 0, (
+        'Убедитесь, что после удаления категории её посты не считаются '
+        'видимыми.')
+
+
+def test_post_delete_ignores_cascaded_comments(mixer, user):
+    kept = mixer.blend('blog.Post', author=user)
+    mixer.blend('blog.Comment', post=kept)
+    deleted = []
+    for comments in (1, 20):
+        post = mixer.blend('blog.Post', author=user)
+        mixer.cycle(comments).blend('blog.Comment', post=post)
+        with CaptureQueriesContext(connection) as queries:
+            post.delete()
+        deleted.append(len(queries))
+    assert deleted[0] == deleted[1], (
+        'Убедитесь, что удаление поста не обновляет счётчики и кэш '
+        'отдельно для каждого удаляемого каскадом комментария.')
+    assert stats_of(user)['comment_count'] == 1, (
+        'Убедитесь, что комментарии удалённого поста вычитаются из '
+        'статистики автора.')
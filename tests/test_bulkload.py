@@ -0,0 +1,33 @@
+import json
+from datetime import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+
+@pytest.mark.django_db
+def test_bulkload_keeps_fixture_timestamps(tmp_path):
+    fixture = tmp_path / 'dataset.ndjson'
+    call_command(
+        'generate_dataset', scale=20, output=str(fixture), stdout=StringIO())
+    records = [
+        json.loads(line)
+        for line in fixture.read_text(encoding='utf-8').splitlines()]
+    call_command('bulkload', str(fixture), stdout=StringIO())
+    for model, label, fields in (
+            (Post, 'blog.post', ('created_at', 'updated_at')),
+            (Comment, 'blog.comment', ('created_at',))):
+        expected = {
+            record['pk']: tuple(
+                datetime.fromisoformat(record['fields'][field])
+                for field in fields)
+            for record in records if record['model'] == label}
+        loaded = {
+            row[0]: row[1:]
+            for row in model.objects.values_list('pk', *fields)}
+        assert loaded == expected, (
+            'Убедитесь, что `bulkload` сохраняет даты создания и изменения '
+            f'из фикстуры для модели {label}.')
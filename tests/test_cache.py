@@ -0,0 +1,151 @@
+import time
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory
+from django.utils import timezone
+
+from blog.cache import (
+    cache_anonymous_page, next_publication, post_card_stats,
+    render_post_card)
+from blog.models import Post
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('no_debug_toolbar'),
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def cached_post(mixer, user):
+    return mixer.blend(
+        'blog.Post', author=user, title='Исходный заголовок',
+        is_published=True, category__is_published=True,
+        pub_date=timezone.now() - timezone.timedelta(days=1))
+
+
+def page_urls(post):
+    return ('/', f'/category/{post.category.slug}/',
+            f'/profile/{post.author.username}/', f'/posts/{post.pk}/')
+
+
+def retitle_silently(post, title):
+    # update() не вызывает сигналов и не сбрасывает кэш.
+    Post.objects.filter(pk=post.pk).update(title=title)
+
+
+def test_post_edit_purges_pages(client, cached_post):
+    for url in page_urls(cached_post):
+        client.get(url)
+    retitle_silently(cached_post, 'Тихая правка')
+    for url in page_urls(cached_post):
+        assert 'Исходный заголовок' in client.get(url).content.decode(), (
+            f'Убедитесь, что страница `{url}` кэшируется для анонимных '
+            'посетителей.')
+    cached_post.title = 'Новый заголовок'
+    cached_post.save()
+    for url in page_urls(cached_post):
+        assert 'Новый заголовок' in client.get(url).content.decode(), (
+            f'Убедитесь, что правка поста сбрасывает кэш страницы `{url}`.')
+
+
+def test_scheduled_post_appears_without_purge(client, mixer, cached_post):
+    scheduled = mixer.blend(
+        'blog.Post', author=cached_post.author, title='Отложенный пост',
+        is_published=True, category=cached_post.category,
+        pub_date=timezone.now() + timezone.timedelta(seconds=1.5))
+    assert next_publication() == scheduled.pub_date, (
+        'Убедитесь, что сохранение отложенного поста обновляет дату '
+        'ближайшей публикации.')
+    assert 'Отложенный пост' not in client.get('/').content.decode()
+    time.sleep(2)
+    assert 'Отложенный пост' in client.get('/').content.decode(), (
+        'Убедитесь, что страницы кэшируются не дольше, чем до ближайшей '
+        'отложенной публикации, и она появляется без сброса кэша.')
+    assert next_publication() is None
+
+
+def test_junk_page_params_share_cache_entry(client, cached_post):
+    client.get('/')
+    retitle_silently(cached_post, 'Тихая правка')
+    for junk in ('abc1', 'abc2', '1'):
+        assert 'Исходный заголовок' in client.get(
+            '/', {'page': junk}).content.decode(), (
+            'Убедитесь, что нечисловой номер страницы попадает в ту же '
+            'запись кэша, что и первая страница.')
+    for title in ('Первая правка', 'Вторая правка'):
+        retitle_silently(cached_post, title)
+        assert title in client.get('/', {'page': 999}).content.decode(), (
+            'Убедитесь, что номер вне диапазона не сохраняется в кэш '
+            'отдельной записью.')
+
+
+def test_authenticated_pages_not_cached(client, user_client, cached_post):
+    user_client.get('/')
+    retitle_silently(cached_post, 'Тихая правка')
+    assert 'Тихая правка' in client.get('/').content.decode(), (
+        'Убедитесь, что страницы авторизованных пользователей не '
+        'сохраняются в кэш для анонимных посетителей.')
+
+
+def test_csrf_pages_not_cached():
+    calls = []
+
+    def view(request):
+        calls.append(request)
+        return HttpResponse(get_token(request))
+
+    page = cache_anonymous_page('test')(view)
+    for _ in range(2):
+        request = RequestFactory().get('/csrf-test/')
+        request.user = AnonymousUser()
+        page(request)
+    assert len(calls) == 2, (
+        'Убедитесь, что страницы с CSRF-токеном не кэшируются: токен '
+        'привязан к cookie конкретного посетителя.')
+
+
+def load_card_post(post):
+    return Post.objects.select_related(
+        'author', 'category', 'location').get(pk=post.pk)
+
+
+def test_post_card_hit_on_second_render(cached_post):
+    first = render_post_card(load_card_post(cached_post))
+    second = render_post_card(load_card_post(cached_post))
+    assert first == second
+    stats = post_card_stats()
+    assert (stats['hits'], stats['misses']) == (1, 1), (
+        'Убедитесь, что повторная отрисовка карточки поста берётся из кэша '
+        'и учитывается в счётчиках попаданий и промахов.')
+    assert stats['avg_render_ms'] > 0 and stats['saved_ms'] > 0
+
+
+@pytest.mark.parametrize('change', ('post', 'category', 'location', 'comment'))
+def test_post_card_miss_after_change(mixer, cached_post, change):
+    cached_post.location = mixer.blend('blog.Location', is_published=True)
+    cached_post.save()
+    render_post_card(load_card_post(cached_post))
+    if change == 'post':
+        cached_post.title = 'Новый текст'
+        cached_post.save()
+    elif change == 'comment':
+        mixer.blend('blog.Comment', post=cached_post)
+    else:
+        related = getattr(cached_post, change)
+        related.title = 'Новый текст'
+        related.save()
+    html = render_post_card(load_card_post(cached_post))
+    assert post_card_stats()['misses'] == 2, (
+        f'Убедитесь, что изменение ({change}) сбрасывает кэш карточки '
+        'поста.')
+    expected = 'Комментарии (1)' if change == 'comment' else 'Новый текст'
+    assert expected in html
@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('no_debug_toolbar'),
+]
+
+
+@pytest.mark.parametrize('url', (
+    '/feeds/rss/', '/feeds/atom/',
+    '/category/{category.slug}/rss/', '/category/{category.slug}/atom/',
+    '/profile/{author.username}/rss/', '/profile/{author.username}/atom/',
+))
+def test_feed_visibility(client, visibility_posts, url):
+    published = visibility_posts[0]
+    response = client.get(
+        url.format(category=published.category, author=published.author))
+    assert response.status_code == HTTPStatus.OK, (
+        f'Убедитесь, что лента `{url}` доступна анонимному пользователю.')
+    content = response.content.decode()
+    assert 'Опубликована' in content, (
+        f'Убедитесь, что в ленте `{url}` есть опубликованные посты.')
+    assert 'Скрыта' not in content and 'Отложена' not in content, (
+        f'Убедитесь, что в ленту `{url}` не попадают снятые с публикации '
+        'и отложенные посты.')
+
+
+def test_author_feed_hides_unpublished_category(
+        client, visibility_posts, mixer):
+    author = visibility_posts[0].author
+    mixer.blend(
+        'blog.Post', title='В скрытой категории', author=author,
+        is_published=True, category__is_published=False,
+        pub_date=timezone.now() - timezone.timedelta(hours=1))
+    for url in (f'/profile/{author.username}/rss/',
+                f'/profile/{author.username}/atom/'):
+        assert 'В скрытой категории' not in client.get(
+            url).content.decode(), (
+            f'Убедитесь, что в ленту автора `{url}` не попадают посты '
+            'из снятых с публикации категорий.')
+
+
+def test_unpublished_category_feed(client, mixer):
+    category = mixer.blend('blog.Category', is_published=False)
+    response = client.get(f'/category/{category.slug}/rss/')
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        'Убедитесь, что лента снятой с публикации категории недоступна.')
+
+
+def test_feed_not_modified_until_new_post(client, visibility_posts, mixer):
+    response = client.get('/feeds/atom/')
+    assert client.get(
+        '/feeds/atom/', HTTP_IF_NONE_MATCH=response['ETag']
+    ).status_code == HTTPStatus.NOT_MODIFIED, (
+        'Убедитесь, что неизменённая лента отдаётся со статусом 304.')
+    published = visibility_posts[0]
+    mixer.blend(
+        'blog.Post', title='Новая', author=published.author,
+        category=published.category, is_published=True,
+        pub_date=timezone.now() - timezone.timedelta(minutes=1))
+    response = client.get(
+        '/feeds/atom/', HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == HTTPStatus.OK and (
+        'Новая' in response.content.decode()), (
+        'Убедитесь, что лента обновляется, когда появляется новый пост.')
@@ -0,0 +1,112 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+from PIL import Image
+
+from blog.images import RENDITIONS, rendition_name
+from blog.jobs import RUNNING_TIMEOUT, claim_job, run_job, strip_exif
+from blog.models import Job
+from blog.templatetags.post_images import image_srcset
+
+MAKE = 0x010F
+ORIENTATION = 0x0112
+
+
+def image_file(image_format, tags):
+    exif = Image.Exif()
+    exif.update(tags)
+    buffer = BytesIO()
+    Image.new('RGB', (40, 20), 'red').save(
+        buffer, image_format, exif=exif.tobytes(), quality=95)
+    return ContentFile(buffer.getvalue())
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return FileSystemStorage(location=tmp_path)
+
+
+def test_strip_exif_png(storage):
+    name = storage.save('photo.png', image_file('PNG', {MAKE: 'SecretCam'}))
+    strip_exif(name, storage)
+    with storage.open(name) as stripped:
+        image = Image.open(stripped)
+        assert MAKE not in image.getexif() and 'exif' not in image.info, (
+            'Убедитесь, что из PNG удаляются метаданные EXIF.')
+    assert storage.listdir('')[1] == [name], (
+        'Убедитесь, что после очистки не остаётся временных файлов.')
+
+
+def test_strip_exif_jpeg_quality(storage):
+    name = storage.save('photo.jpg', image_file('JPEG', {MAKE: 'SecretCam'}))
+    with storage.open(name) as original:
+        quantization = Image.open(original).quantization
+    strip_exif(name, storage)
+    with storage.open(name) as stripped:
+        image = Image.open(stripped)
+        assert MAKE not in image.getexif(), (
+            'Убедитесь, что из JPEG удаляются метаданные EXIF.')
+        assert image.quantization == quantization, (
+            'Убедитесь, что неповёрнутый JPEG сохраняется с исходным '
+            'качеством.')
+
+
+def test_strip_exif_applies_orientation(storage):
+    name = storage.save('photo.jpg', image_file('JPEG', {ORIENTATION: 6}))
+    strip_exif(name, storage)
+    with storage.open(name) as stripped:
+        image = Image.open(stripped)
+        assert image.size == (20, 40) and not image.getexif(), (
+            'Убедитесь, что поворот из EXIF применяется к пикселям, '
+            'а сами метаданные удаляются.')
+
+
+@pytest.mark.django_db
+def test_claim_job_requeues_stale_running():
+    job = Job.objects.create(task='process_image', status=Job.RUNNING)
+    assert claim_job() is None
+    Job.objects.filter(pk=job.pk).update(
+        updated_at=timezone.now() - timezone.timedelta(
+            seconds=RUNNING_TIMEOUT + 1))
+    claimed = claim_job()
+    assert claimed is not None and claimed.pk == job.pk, (
+        'Убедитесь, что задача, зависшая в статусе «выполняется» после '
+        'падения обработчика, снова выдаётся в работу.')
+    claimed.refresh_from_db()
+    assert claimed.status == Job.RUNNING and claimed.attempts == 1, (
+        'Убедитесь, что оборванный запуск засчитывается как попытка.')
+
+
+@pytest.mark.django_db
+def test_process_image_creates_renditions(settings, tmp_path, mixer, user):
+    settings.MEDIA_ROOT = tmp_path
+    buffer = BytesIO()
+    Image.new('RGB', (3000, 1500), 'red').save(buffer, 'JPEG')
+    post = mixer.blend('blog.Post', author=user, image=None)
+    post.image.save('photo.jpg', ContentFile(buffer.getvalue()))
+    assert image_srcset(post.image) == (
+        f'src="{post.image.url}" srcset="{post.image.url} 1x, '
+        f'{post.image.url} 2x"'), (
+        'Убедитесь, что до обработки карточка ссылается на исходный файл.')
+    job = run_job(claim_job())
+    assert job.task == 'process_image' and job.status == Job.DONE, (
+        'Убедитесь, что сохранение поста с картинкой ставит в очередь '
+        'задачу обработки изображения.')
+    for rendition, width in RENDITIONS.items():
+        name = rendition_name(post.image.name, rendition)
+        assert post.image.storage.exists(name), (
+            f'Убедитесь, что задача создаёт вариант `{rendition}`.')
+        with post.image.storage.open(name) as variant:
+            assert Image.open(variant).size == (width, width // 2), (
+                f'Убедитесь, что вариант `{rendition}` уменьшен до ширины '
+                f'{width} пикселей.')
+    card, retina = (
+        post.image.storage.url(rendition_name(post.image.name, rendition))
+        for rendition in ('card', 'card@2x'))
+    assert image_srcset(post.image) == (
+        f'src="{card}" srcset="{card} 1x, {retina} 2x"'), (
+        'Убедитесь, что после обработки карточка ссылается на варианты '
+        'изображения.')
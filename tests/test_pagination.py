@@ -0,0 +1,157 @@
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from blog.constants import COMMENTS_PER_PAGE
+from blog.feed import post_feed
+from blog.models import Comment, Post
+from blog.pagination import KeysetPaginator, comment_batch
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('no_debug_toolbar'),
+]
+
+PER_PAGE = 4
+
+
+@pytest.fixture
+def keyset_posts(mixer, user):
+    # По три поста на одну дату: границы страниц попадают внутрь групп
+    # с одинаковым pub_date.
+    start = timezone.now() - timezone.timedelta(days=30)
+    posts = mixer.cycle(11).blend(
+        'blog.Post', author=user, is_published=True,
+        category__is_published=True,
+        pub_date=(start + timezone.timedelta(days=day // 3)
+                  for day in range(11)))
+    return sorted(posts, key=lambda post: (post.pub_date, post.pk),
+                  reverse=True)
+
+
+def pages(paginator, param, page):
+    while True:
+        yield page
+        cursor = (page.older_cursor if param == 'after'
+                  else page.newer_cursor)
+        if cursor is None:
+            return
+        page = paginator.get_page({param: cursor})
+
+
+def test_keyset_pages_walk_feed(keyset_posts):
+    paginator = KeysetPaginator(post_feed, PER_PAGE)
+    first = paginator.get_page({})
+    assert list(first) == keyset_posts[:PER_PAGE], (
+        'Убедитесь, что первая страница начинается с самых свежих постов.')
+    assert not first.has_previous() and first.has_next()
+    older = list(pages(paginator, 'after', first))
+    assert [post for page in older for post in page] == keyset_posts, (
+        'Убедитесь, что страницы по курсору «after» проходят всю ленту '
+        'без пропусков и повторов, в том числе при равных pub_date.')
+    last = older[-1]
+    assert len(last) == len(keyset_posts) % PER_PAGE and (
+        not last.has_next() and last.older_cursor is None), (
+        'Убедитесь, что на последней странице нет ссылки на более '
+        'старые посты.')
+    newer = list(pages(paginator, 'before', last))
+    assert [list(page) for page in newer[1:]] == [
+        list(page) for page in reversed(older[:-1])], (
+        'Убедитесь, что страницы по курсору «before» возвращают к началу '
+        'ленты теми же страницами.')
+    assert newer[-1].newer_cursor is None
+
+
+def test_keyset_page_skips_hidden_posts(keyset_posts):
+    Post.objects.filter(pk=keyset_posts[PER_PAGE].pk).update(
+        is_published=False)
+    paginator = KeysetPaginator(post_feed, PER_PAGE)
+    second = paginator.get_page(
+        {'after': paginator.get_page({}).older_cursor})
+    assert list(second) == keyset_posts[PER_PAGE + 1:2 * PER_PAGE + 1], (
+        'Убедитесь, что страницы по курсору учитывают видимость постов.')
+
+
+def test_keyset_index_view(client, settings, keyset_posts):
+    settings.POSTS_PAGINATION = 'keyset'
+    settings.PAGE_CACHE_TIMEOUT = 0
+    response = client.get('/')
+    cursor = response.context['page_obj'].older_cursor
+    response = client.get('/', {'after': cursor})
+    assert response.status_code == HTTPStatus.OK
+    assert list(response.context['page_obj']) == keyset_posts[10:], (
+        'Убедитесь, что главная страница листается по курсору.')
+
+
+def test_keyset_paginator_known_count(
+        keyset_posts, django_assert_num_queries):
+    paginator = KeysetPaginator(
+        lambda now: Post.objects.all(), 10, count_limit=100, count=1)
+    with django_assert_num_queries(1):
+        paginator.get_page({})
+        assert paginator.approximate_count == 1, (
+            'Убедитесь, что переданное в KeysetPaginator число записей '
+            'используется вместо запроса COUNT.')
+
+
+@pytest.fixture
+def batched_post(mixer, user):
+    # По три комментария на одну дату: границы пачек попадают внутрь
+    # групп с одинаковым created_at.
+    post = mixer.blend(
+        'blog.Post', author=user, is_published=True,
+        category__is_published=True,
+        pub_date=timezone.now() - timezone.timedelta(days=1))
+    start = timezone.now() - timezone.timedelta(hours=1)
+    for index, comment in enumerate(
+            mixer.cycle(2 * COMMENTS_PER_PAGE + 5).blend(
+                'blog.Comment', post=post)):
+        Comment.objects.filter(pk=comment.pk).update(
+            created_at=start + timezone.timedelta(minutes=index // 3))
+    return post
+
+
+def comment_batches(post):
+    token = ''
+    while True:
+        comments, token = comment_batch(post.comments.all(), token)
+        yield comments
+        if token is None:
+            return
+
+
+def test_comment_batches_walk_comments(batched_post):
+    batches = list(comment_batches(batched_post))
+    assert [len(batch) for batch in batches] == [
+        COMMENTS_PER_PAGE, COMMENTS_PER_PAGE, 5], (
+        'Убедитесь, что комментарии отдаются пачками по '
+        f'{COMMENTS_PER_PAGE}, а последняя пачка не содержит курсора.')
+    assert [comment for batch in batches for comment in batch] == list(
+        batched_post.comments.order_by('created_at', 'pk')), (
+        'Убедитесь, что пачки комментариев идут без пропусков и повторов, '
+        'в том числе при равных created_at.')
+
+
+def test_comment_batches_full_last_batch(batched_post):
+    latest = batched_post.comments.order_by('-created_at', '-pk')[:5]
+    Comment.objects.filter(
+        pk__in=list(latest.values_list('pk', flat=True))).delete()
+    batches = list(comment_batches(batched_post))
+    assert [len(batch) for batch in batches] == [
+        COMMENTS_PER_PAGE, COMMENTS_PER_PAGE], (
+        'Убедитесь, что после полной последней пачки курсор не выдаётся.')
+
+
+def test_post_comments_endpoint(client, batched_post):
+    response = client.get(f'/posts/{batched_post.pk}/')
+    cursor = response.context['next_comments_cursor']
+    response = client.get(
+        f'/posts/{batched_post.pk}/comments/', {'after': cursor})
+    assert response.status_code == HTTPStatus.OK
+    expected = list(batched_post.comments.order_by('created_at', 'pk'))
+    assert list(response.context['comments']) == expected[
+        COMMENTS_PER_PAGE:2 * COMMENTS_PER_PAGE], (
+        'Убедитесь, что «Загрузить ещё» отдаёт следующую пачку '
+        'комментариев.')
+    assert response.context['next_comments_cursor'] is not None
@@ -0,0 +1,232 @@
+import json
+import os
+import time
+from http import HTTPStatus
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver
+from django.utils import timezone
+
+from blog.cache import refresh_next_publication
+from blog.lookups import warm_lookups
+from blog.models import Comment, Post
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('no_debug_toolbar'),
+]
+
+# Данных столько, чтобы страница, выводящая все посты или комментарии
+# вместо одной страницы, не укладывалась в бюджет времени.
+N_POSTS = int(os.getenv('PERF_POSTS', 2000))
+N_COMMENTS = int(os.getenv('PERF_COMMENTS', 5000))
+# Отчёт пишется, только если задан путь к нему.
+REPORT_PATH = os.getenv('PERF_REPORT')
+# Пространства имён приложений проекта; админка и django.contrib.auth
+# не проверяются.
+APP_NAMESPACES = ('blog', 'pages')
+
+# Маршрут: (метод, шаблон адреса, код ответа, запросов, мс).
+BUDGETS = {
+    'blog:index': ('get', '/', HTTPStatus.OK, 4, 500),
+    'blog:category_posts': (
+        'get', '/category/{category.slug}/', HTTPStatus.OK, 4, 500),
+    'blog:profile': (
+        'get', '/profile/{user.username}/', HTTPStatus.OK, 4, 500),
+    'blog:edit_profile': ('get', '/edit_profile/', HTTPStatus.OK, 2, 300),
+    'blog:create_post': ('get', '/posts/create/', HTTPStatus.OK, 4, 300),
+    'blog:post_detail': ('get', '/posts/{post.id}/', HTTPStatus.OK, 4, 500),
+    'blog:post_comments': (
+        'get', '/posts/{post.id}/comments/', HTTPStatus.OK, 4, 300),
+    'blog:edit_post': (
+        'get', '/posts/{post.id}/edit/', HTTPStatus.OK, 6, 300),
+    'blog:delete_post': (
+        'get', '/posts/{post.id}/delete/', HTTPStatus.OK, 3, 300),
+    'blog:add_comment': (
+        'post', '/{post.id}/comment/', HTTPStatus.FOUND, 6, 300),
+    'blog:edit_comment': (
+        'get', '/posts/{post.id}/edit_comment/{comment.id}/',
+        HTTPStatus.OK, 4, 300),
+    'blog:delete_comment': (
+        'get', '/posts/{post.id}/delete_comment/{comment.id}/',
+        HTTPStatus.OK, 3, 300),
+    'blog:search': ('get', '/search/?q=post', HTTPStatus.OK, 4, 500),
+    'blog:feed_rss': ('get', '/feeds/rss/', HTTPStatus.OK, 3, 500),
+    'blog:feed_atom': ('get', '/feeds/atom/', HTTPStatus.OK, 3, 500),
+    'blog:category_feed_rss': (
+        'get', '/category/{category.slug}/rss/', HTTPStatus.OK, 3, 500),
+    'blog:category_feed_atom': (
+        'get', '/category/{category.slug}/atom/', HTTPStatus.OK, 3, 500),
+    'blog:profile_feed_rss': (
+        'get', '/profile/{user.username}/rss/', HTTPStatus.OK, 4, 500),
+    'blog:profile_feed_atom': (
+        'get', '/profile/{user.username}/atom/', HTTPStatus.OK, 4, 500),
+    'blog:sitemap': ('get', '/sitemap.xml', HTTPStatus.OK, 3, 500),
+    'blog:sitemap_section': (
+        'get', '/sitemap-posts-0.xml', HTTPStatus.OK, 1, 500),
+    'blog:api_posts': ('get', '/api/posts/', HTTPStatus.OK, 3, 300),
+    'blog:api_post_detail': (
+        'get', '/api/posts/{post.id}/', HTTPStatus.OK, 3, 300),
+    'blog:api_post_comments': (
+        'get', '/api/posts/{post.id}/comments/', HTTPStatus.OK, 4, 300),
+    'blog:api_category_posts': (
+        'get', '/api/category/{category.slug}/posts/', HTTPStatus.OK, 3,
+        300),
+    'blog:api_profile_posts': (
+        'get', '/api/profile/{user.username}/posts/', HTTPStatus.OK, 4,
+        300),
+    'pages:about': ('get', '/pages/about/', HTTPStatus.OK, 2, 200),
+    'pages:rules': ('get', '/pages/rules/', HTTPStatus.OK, 2, 200),
+    'registration': (
+        'get', '/auth/registration/', HTTPStatus.OK, 2, 300),
+}
+
+# Маршрут: (запросов, мс) для анонимного посетителя с пустым кэшем
+# (включая справочники категорий и мест) и с прогретым кэшем страниц.
+ANONYMOUS_BUDGETS = {
+    'blog:index': ((7, 500), (0, 50)),
+    'blog:category_posts': ((7, 500), (0, 50)),
+    'blog:profile': ((7, 500), (0, 50)),
+    'blog:post_detail': ((5, 500), (0, 50)),
+    'blog:post_comments': ((4, 300), (2, 300)),
+    'blog:search': ((2, 500), (2, 500)),
+    'blog:feed_rss': ((6, 500), (0, 50)),
+    'blog:feed_atom': ((6, 500), (0, 50)),
+    'blog:category_feed_rss': ((6, 500), (0, 50)),
+    'blog:category_feed_atom': ((6, 500), (0, 50)),
+    'blog:profile_feed_rss': ((7, 500), (0, 50)),
+    'blog:profile_feed_atom': ((7, 500), (0, 50)),
+    'blog:sitemap': ((4, 500), (0, 50)),
+    'blog:sitemap_section': ((2, 500), (1, 500)),
+    'blog:api_posts': ((4, 300), (3, 300)),
+    'blog:api_post_detail': ((2, 300), (1, 300)),
+    'blog:api_post_comments': ((2, 300), (2, 300)),
+    'blog:api_category_posts': ((4, 300), (3, 300)),
+    'blog:api_profile_posts': ((5, 300), (4, 300)),
+    'pages:about': ((1, 200), (0, 50)),
+    'pages:rules': ((1, 200), (0, 50)),
+    'registration': ((0, 300), (0, 300)),
+}
+
+
+def route_names(patterns, namespace=None):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if namespace is None and pattern.namespace in APP_NAMESPACES:
+                yield from route_names(
+                    pattern.url_patterns, pattern.namespace)
+        elif pattern.name:
+            yield f'{namespace}:{pattern.name}' if namespace else pattern.name
+
+
+@pytest.fixture
+def perf_data(mixer, user):
+    # Посты и комментарии вставляются пачкой, а счётчики и поисковый
+    # индекс пересчитываются после, как в bulkload: иначе заполнение
+    # таблиц через сигналы заняло бы больше времени, чем сами замеры.
+    category = mixer.blend('blog.Category', is_published=True)
+    location = mixer.blend('blog.Location', is_published=True)
+    pub_date = timezone.now() - timezone.timedelta(days=1)
+    Post.objects.bulk_create(
+        Post(title=f'Post {index}', text=f'Текст поста {index}',
+             author=user, category=category, location=location,
+             is_published=True, pub_date=pub_date)
+        for index in range(N_POSTS))
+    post = Post.objects.latest('pk')
+    Comment.objects.bulk_create(
+        Comment(text=f'Комментарий {index}', post=post, author=user)
+        for index in range(N_COMMENTS))
+    for command in ('recount_comments', 'recount_author_stats',
+                    'rebuild_search_index'):
+        call_command(command, stdout=StringIO())
+    cache.clear()
+    warm_lookups()
+    refresh_next_publication()
+    return {
+        'user': user,
+        'category': category,
+        'post': post,
+        'comment': post.comments.earliest('pk'),
+    }
+
+
+def measure(client, method, url):
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        if method == 'post':
+            response = client.post(url, {'text': 'Комментарий'})
+        else:
+            response = client.get(url)
+        total = time.perf_counter() - start
+    sql_time = sum(float(query['time']) for query in queries)
+    return response, {
+        'queries': len(queries),
+        'sql_ms': round(sql_time * 1000, 2),
+        'render_ms': round((total - sql_time) * 1000, 2),
+        'total_ms': round(total * 1000, 2),
+    }
+
+
+def exceeded_budget(name, stats, max_queries, max_ms):
+    if stats['queries'] > max_queries or stats['total_ms'] > max_ms:
+        return (f'{name}: {stats["queries"]} запросов '
+                f'(лимит {max_queries}), {stats["total_ms"]} мс '
+                f'(лимит {max_ms})')
+    return None
+
+
+def test_every_route_has_budget():
+    missing = set(route_names(get_resolver().url_patterns)) - set(BUDGETS)
+    assert not missing, (
+        'Задайте бюджет производительности для маршрутов: '
+        + ', '.join(sorted(missing)))
+
+
+def test_route_budgets(user_client, perf_data):
+    report = {}
+    exceeded = []
+    for name, (method, url, status, max_queries, max_ms) in BUDGETS.items():
+        url = url.format(**perf_data)
+        response, stats = measure(user_client, method, url)
+        assert response.status_code == status, (
+            f'Убедитесь, что {url} отвечает статусом {status}.')
+        report[name] = dict(stats, url=url, max_queries=max_queries,
+                            max_ms=max_ms)
+        message = exceeded_budget(name, stats, max_queries, max_ms)
+        if message:
+            exceeded.append(message)
+    if REPORT_PATH:
+        Path(REPORT_PATH).write_text(
+            json.dumps({'posts': N_POSTS, 'comments': N_COMMENTS,
+                        'routes': report}, ensure_ascii=False, indent=2),
+            encoding='utf-8')
+    assert not exceeded, (
+        'Превышен бюджет производительности:\n' + '\n'.join(exceeded))
+
+
+@pytest.mark.parametrize('warm', (False, True), ids=('cold', 'warm'))
+def test_anonymous_route_budgets(client, perf_data, warm):
+    exceeded = []
+    for name, budgets in ANONYMOUS_BUDGETS.items():
+        method, url, status, *_ = BUDGETS[name]
+        url = url.format(**perf_data)
+        cache.clear()
+        if warm:
+            client.get(url)
+        response, stats = measure(client, method, url)
+        assert response.status_code == status, (
+            f'Убедитесь, что {url} отвечает анонимному посетителю статусом '
+            f'{status}.')
+        message = exceeded_budget(name, stats, *budgets[warm])
+        if message:
+            exceeded.append(message)
+    assert not exceeded, (
+        'Превышен бюджет производительности для анонимного посетителя '
+        f'({"прогретый" if warm else "пустой"} кэш):\n'
+        + '\n'.join(exceeded))
@@ -0,0 +1,139 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.utils import timezone
+
+from blog.conditional import content_changed_at
+from blog.lookups import published_category, warm_lookups
+from blog.management.commands import check_query_plans
+from blog.models import Post
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('no_debug_toolbar'),
+]
+
+
+@pytest.fixture
+def commented_post(mixer, user):
+    post = mixer.blend(
+        'blog.Post', author=user, is_published=True,
+        pub_date=timezone.now() - timezone.timedelta(days=1),
+        category__is_published=True)
+    mixer.cycle(5).blend('blog.Comment', post=post)
+    return post
+
+
+def test_post_detail_queries(
+        client, commented_post, django_assert_num_queries):
+    warm_lookups()
+    with django_assert_num_queries(2):
+        response = client.get(f'/posts/{commented_post.id}/')
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что страница публикации отображается без ошибок.')
+    assert len(response.context['comments']) == 5
+
+
+def test_post_detail_missing(client):
+    response = client.get('/posts/999999/')
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        'Убедитесь, что при обращении к странице несуществующей публикации '
+        'возвращается статус 404.')
+
+
+def test_post_detail_not_modified(client, commented_post, mixer):
+    url = f'/posts/{commented_post.id}/'
+    response = client.get(url)
+    assert response.has_header('ETag') and response.has_header(
+        'Last-Modified'), (
+        'Убедитесь, что страница публикации отдаёт заголовки ETag '
+        'и Last-Modified.')
+    assert client.get(
+        url, HTTP_IF_NONE_MATCH=response['ETag']
+    ).status_code == HTTPStatus.NOT_MODIFIED, (
+        'Убедитесь, что для неизменённой публикации возвращается статус 304.')
+    mixer.blend('blog.Comment', post=commented_post)
+    assert client.get(
+        url, HTTP_IF_NONE_MATCH=response['ETag']
+    ).status_code == HTTPStatus.OK, (
+        'Убедитесь, что после нового комментария страница публикации '
+        'отдаётся целиком.')
+
+
+def test_index_not_modified(client, commented_post):
+    response = client.get('/')
+    assert client.get(
+        '/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+    ).status_code == HTTPStatus.NOT_MODIFIED, (
+        'Убедитесь, что для неизменённой ленты возвращается статус 304.')
+    commented_post.is_published = False
+    commented_post.save()
+    assert client.get(
+        '/', HTTP_IF_NONE_MATCH=response['ETag']
+    ).status_code == HTTPStatus.OK, (
+        'Убедитесь, что после снятия публикации лента отдаётся целиком.')
+
+
+def test_category_queries(client, commented_post, mixer,
+                          django_assert_num_queries):
+    warm_lookups()
+    category = commented_post.category
+    # Две даты для Last-Modified, COUNT и страница выдачи; категория
+    # берётся из кэшированной таблицы без запроса.
+    with django_assert_num_queries(4):
+        response = client.get(f'/category/{category.slug}/')
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что страница категории отображается без ошибок.')
+    assert list(response.context['page_obj']) == [commented_post]
+    hidden = mixer.blend('blog.Category', is_published=False)
+    warm_lookups()
+    with django_assert_num_queries(0):
+        response = client.get(f'/category/{hidden.slug}/')
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        'Убедитесь, что для неопубликованной категории сразу возвращается '
+        'статус 404, без запросов публикаций.')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_category_lookup_refreshed_after_commit(client, mixer):
+    warm_lookups()
+    with transaction.atomic():
+        category = mixer.blend('blog.Category', is_published=True)
+        assert published_category(category.slug) is None, (
+            'Убедитесь, что кэш категорий сбрасывается только после '
+            'фиксации транзакции.')
+    assert published_category(category.slug) == category
+    assert client.get(
+        f'/category/{category.slug}/').status_code == HTTPStatus.OK, (
+        'Убедитесь, что новая категория доступна сразу после фиксации.')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_content_changed_after_commit(mixer):
+    location = mixer.blend('blog.Location')
+    changed_at = content_changed_at()
+    with transaction.atomic():
+        location.delete()
+        assert content_changed_at() == changed_at, (
+            'Убедитесь, что отметка изменения контента для ETag и '
+            'Last-Modified обновляется только после фиксации транзакции.')
+    assert content_changed_at() > changed_at
+
+
+def test_check_query_plans():
+    out = StringIO()
+    call_command('check_query_plans', stdout=out)
+    assert 'Все запросы используют индексы.' in out.getvalue(), (
+        'Убедитесь, что запросы ленты, категории и профиля идут по '
+        'индексам.')
+
+
+def test_check_query_plans_reports_full_scan(monkeypatch):
+    monkeypatch.setattr(
+        check_query_plans, 'post_feed',
+        lambda: Post.objects.filter(title='Без индекса'))
+    with pytest.raises(CommandError, match=r'index \(blog_post\)'):
+        call_command('check_query_plans', stdout=StringIO())
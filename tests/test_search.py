@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from blog.search import fts_available
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('no_debug_toolbar'),
+]
+
+
+def indexed_ids(word):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT rowid FROM blog_post_fts WHERE blog_post_fts MATCH %s',
+            [word])
+        return {row[0] for row in cursor.fetchall()}
+
+
+def found_titles(client, query):
+    response = client.get('/search/', {'q': query})
+    assert response.status_code == HTTPStatus.OK, (
+        f'Убедитесь, что поиск по запросу `{query}` не падает.')
+    return {post.title for post in response.context['page_obj']}
+
+
+@pytest.fixture
+def search_posts(mixer, visibility_posts):
+    published = visibility_posts[0]
+    return [*visibility_posts, mixer.blend(
+        'blog.Post', author=published.author, text=published.text,
+        title='В скрытой категории', is_published=True,
+        category__is_published=False, pub_date=published.pub_date)]
+
+
+@pytest.mark.skipif(
+    not fts_available(), reason='Полнотекстовый индекс есть только в SQLite.')
+def test_search_index_follows_writes(mixer, user):
+    post = mixer.blend('blog.Post', author=user, title='Черепаха')
+    assert indexed_ids('Черепаха') == {post.pk}, (
+        'Убедитесь, что новый пост попадает в полнотекстовый индекс.')
+    post.title = 'Улитка'
+    post.save()
+    assert not indexed_ids('Черепаха') and indexed_ids('Улитка') == {
+        post.pk}, (
+        'Убедитесь, что при изменении поста индекс обновляется.')
+    post.delete()
+    assert not indexed_ids('Улитка'), (
+        'Убедитесь, что удалённый пост убирается из индекса.')
+
+
+def test_search_visibility(client, search_posts):
+    assert found_titles(client, 'черепаху') == {'Опубликована'}, (
+        'Убедитесь, что поиск не показывает снятые с публикации, '
+        'отложенные посты и посты из скрытых категорий.')
+
+
+@pytest.mark.parametrize('query', (
+    '"', 'черепаху"', 'NEAR(', 'NEAR(черепаху', '*', 'черепаху*',
+    'OR', 'черепаху AND', '(', 'title:', '^', '-',
+))
+def test_search_hostile_query(client, search_posts, query):
+    titles = found_titles(client, query)
+    assert titles <= {'Опубликована'}, (
+        f'Убедитесь, что запрос `{query}` ищет слова как есть, '
+        'а не как синтаксис FTS5.')
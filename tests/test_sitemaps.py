@@ -0,0 +1,138 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections, transaction
+
+from blog.lookups import warm_lookups
+from blog.sitemaps import chunk_of, sitemap_version
+
+pytestmark = pytest.mark.django_db
+
+
+def content(response):
+    if response.streaming:
+        return b''.join(response.streaming_content).decode()
+    return response.content.decode()
+
+
+def test_sitemap_index(client, visibility_posts):
+    response = client.get('/sitemap.xml')
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что страница `/sitemap.xml` доступна.')
+    index = content(response)
+    for section in ('posts', 'categories', 'profiles'):
+        assert f'/sitemap-{section}-0.xml' in index, (
+            'Убедитесь, что индекс sitemap ссылается на фрагменты '
+            f'раздела `{section}`.')
+
+
+def test_visibility_posts_visibility(client, visibility_posts):
+    published, hidden, scheduled = visibility_posts
+    urls = content(client.get(
+        f'/sitemap-posts-{chunk_of(published.pk)}.xml'))
+    assert f'/posts/{published.pk}/<' in urls, (
+        'Убедитесь, что опубликованные посты попадают в sitemap.')
+    for post in (hidden, scheduled):
+        assert f'/posts/{post.pk}/<' not in urls, (
+            'Убедитесь, что снятые с публикации и отложенные посты '
+            'не попадают в sitemap.')
+
+
+def test_sitemap_chunk_regenerated_on_change(client, visibility_posts):
+    published = visibility_posts[0]
+    url = f'/sitemap-posts-{chunk_of(published.pk)}.xml'
+    assert client.get(url).streaming, (
+        'Убедитесь, что фрагмент sitemap отдаётся потоком.')
+    content(client.get(url))
+    assert not client.get(url).streaming, (
+        'Убедитесь, что неизменённый фрагмент sitemap берётся из кэша.')
+    published.is_published = False
+    published.save()
+    response = client.get(url)
+    assert response.streaming and (
+        f'/posts/{published.pk}/<' not in content(response)), (
+        'Убедитесь, что фрагмент sitemap пересоздаётся после изменения '
+        'его постов.')
+
+
+def asgi_get(path):
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    # Как и AsyncClient, не закрываем соединение тестовой транзакции.
+    request_started.disconnect(close_old_connections)
+    request_finished.disconnect(close_old_connections)
+    try:
+        async_to_sync(ASGIHandler())({
+            'type': 'http', 'asgi': {'version': '3.0'},
+            'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': path, 'raw_path': path.encode(), 'query_string': b'',
+            'root_path': '', 'headers': [(b'host', b'testserver')],
+            'client': ('127.0.0.1', 1234), 'server': ('testserver', 80),
+        }, receive, send)
+    finally:
+        request_started.connect(close_old_connections)
+        request_finished.connect(close_old_connections)
+    return messages[0]['status'], b''.join(
+        message.get('body', b'') for message in messages[1:]).decode()
+
+
+def test_sitemap_under_asgi(visibility_posts):
+    published = visibility_posts[0]
+    for path in ('/sitemap.xml',
+                 f'/sitemap-posts-{chunk_of(published.pk)}.xml'):
+        status, body = asgi_get(path)
+        assert status == HTTPStatus.OK and body.rstrip().endswith('>') and (
+            '</sitemapindex>' in body or '</urlset>' in body), (
+            'Убедитесь, что sitemap целиком отдаётся через ASGI: запросы '
+            'к базе нельзя выполнять во время отдачи потока.')
+
+
+def test_sitemap_under_asgi_cold_cache(visibility_posts):
+    cache.clear()
+    status, body = asgi_get(
+        f'/sitemap-posts-{chunk_of(visibility_posts[0].pk)}.xml')
+    assert status == HTTPStatus.OK and body.rstrip().endswith('</urlset>'), (
+        'Убедитесь, что при пустом кэше срок хранения фрагмента sitemap '
+        'вычисляется до отдачи потока, а не в цикле событий.')
+
+
+def test_sitemap_index_kept_on_post_edit(
+        client, visibility_posts, django_assert_num_queries):
+    published = visibility_posts[0]
+    warm_lookups()
+    client.get('/sitemap.xml')
+    published.title = 'Новый заголовок'
+    published.save()
+    with django_assert_num_queries(0):
+        client.get('/sitemap.xml')
+    published.is_published = False
+    published.save()
+    assert f'/sitemap-posts-{chunk_of(published.pk)}.xml' not in content(
+        client.get('/sitemap.xml')), (
+        'Убедитесь, что индекс sitemap пересчитывается, когда фрагмент '
+        'раздела опустел.')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sitemap_invalidated_after_commit(visibility_posts):
+    published = visibility_posts[0]
+    chunk = chunk_of(published.pk)
+    version = sitemap_version('posts', chunk)
+    with transaction.atomic():
+        published.is_published = False
+        published.save()
+        assert sitemap_version('posts', chunk) == version, (
+            'Убедитесь, что фрагмент sitemap сбрасывается только после '
+            'фиксации транзакции: иначе запрос до фиксации сохранит '
+            'в кэш прежний фрагмент.')
+    assert sitemap_version('posts', chunk) != version
@@ -0,0 +1,71 @@
+import copy
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.template import engines
+from django.utils import timezone
+
+from blog.models import Post
+from blog.warmup import cached_loaders, warm_templates
+
+
+def test_warm_templates_fills_cached_loader(settings):
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+    settings.TEMPLATES = templates
+    names = {name for name, _ in warm_templates()}
+    assert {'includes/post_card.html', 'includes/comments.html',
+            'includes/paginator.html'} <= names, (
+        'Убедитесь, что прогрев компилирует шаблоны из каталога templates/.')
+    loader, = cached_loaders(engines['django'].engine)
+    assert names <= set(loader.get_template_cache), (
+        'Убедитесь, что прогретые шаблоны попадают в кэширующий загрузчик.')
+
+
+def test_publications_warm_needs_shared_cache():
+    with pytest.raises(CommandError):
+        call_command('publications', warm=True, stdout=StringIO())
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    settings.CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(tmp_path),
+    }}
+
+
+@pytest.fixture
+def due_post(mixer, user):
+    return mixer.blend(
+        'blog.Post', author=user, title='Отложенный пост',
+        is_published=True, category__is_published=True,
+        pub_date=timezone.now() + timezone.timedelta(seconds=1))
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('shared_cache', 'no_debug_toolbar')
+def test_publications_warm_fills_cache(client, due_post):
+    output = StringIO()
+    call_command('publications', warm=True, within=10, stdout=output)
+    assert f'Прогрет кэш для #{due_post.pk}' in output.getvalue()
+    Post.objects.filter(pk=due_post.pk).update(title='Тихая правка')
+    assert 'Отложенный пост' in client.get(
+        f'/posts/{due_post.pk}/').content.decode(), (
+        'Убедитесь, что `publications --warm` сохраняет страницы '
+        'вышедшей публикации в общий кэш.')
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('shared_cache')
+def test_publications_warm_fails_on_error_status(settings, due_post):
+    settings.ALLOWED_HOSTS = ['blogicum.example']
+    with pytest.raises(CommandError):
+        call_command('publications', warm=True, stdout=StringIO())